@@ -0,0 +1,167 @@
+"""
+Análisis de reglas sombreadas, redundantes y en conflicto.
+
+Con la regla de selección del simulador (mayor especificidad y, a igualdad,
+la primera), una regla R sólo puede quedar tapada entera por otra anterior
+del mismo grupo (servicio, origen, destino) cuyo protocolo y puerto sean
+iguales a los de R o comodín: una regla con otras claves o nunca cubre
+todos los flujos de R o es menos específica.
+
+Por eso basta agrupar por claves con un dict y recorrer cada grupo en orden
+guardando la primera regla de cada (protocolo, puerto) y de cada acción:
+cada regla se resuelve con unas pocas búsquedas, O(n) en total, sin
+comparar reglas por pares.
+
+- regla_sombreada: una regla anterior con la acción contraria la cubre; nunca se aplica.
+- regla_redundante: una regla anterior con la misma acción la cubre; se puede borrar.
+- reglas_en_conflicto: una regla anterior con la acción contraria se solapa
+  con parte de sus flujos y decide en ellos por ir antes.
+"""
+
+from motor_politicas import _comodin
+
+
+def _accion(regla):
+    # Igual que en la simulación: todo lo que no es "denegar" permite
+    return "denegar" if (regla.accion or "").lower() == "denegar" else "permitir"
+
+
+class _Grupo:
+    """Reglas de un mismo (firewall, servicio, origen, destino) vistas hasta ahora."""
+
+    def __init__(self):
+        # (protocolo, puerto) -> primera regla
+        self.por_clave = {}
+        # acción -> primera regla; (acción, protocolo) y (acción, puerto) ->
+        # primera regla con ese protocolo/puerto (el otro campo, cualquiera)
+        self.por_accion = {}
+        self.por_accion_protocolo = {}
+        self.por_accion_puerto = {}
+
+    def cubre(self, protocolo, puerto):
+        """Primera regla anterior cuyo protocolo/puerto cubre (protocolo, puerto)."""
+        claves = [(None, None)]
+        if puerto is not None:
+            claves.append((None, puerto))
+        if protocolo is not None:
+            claves.append((protocolo, None))
+            if puerto is not None:
+                claves.append((protocolo, puerto))
+        return _primera(self.por_clave.get(c) for c in claves)
+
+    def solapa(self, accion, protocolo, puerto):
+        """Primera regla anterior con `accion` que comparte algún flujo con (protocolo, puerto)."""
+        if protocolo is None and puerto is None:
+            return self.por_accion.get(accion)
+        if puerto is None:
+            # Cualquier puerto con protocolo comodín o el mismo protocolo
+            return _primera((
+                self.por_accion_protocolo.get((accion, None)),
+                self.por_accion_protocolo.get((accion, protocolo)),
+            ))
+        if protocolo is None:
+            return _primera((
+                self.por_accion_puerto.get((accion, None)),
+                self.por_accion_puerto.get((accion, puerto)),
+            ))
+        # Con protocolo y puerto concretos todo solape es cobertura
+        return None
+
+    def agregar(self, regla, protocolo, puerto):
+        accion = _accion(regla)
+        self.por_clave.setdefault((protocolo, puerto), regla)
+        self.por_accion.setdefault(accion, regla)
+        self.por_accion_protocolo.setdefault((accion, protocolo), regla)
+        self.por_accion_puerto.setdefault((accion, puerto), regla)
+
+
+def _primera(reglas):
+    mejor = None
+    for regla in reglas:
+        if regla is not None and (mejor is None or regla.posicion < mejor.posicion):
+            mejor = regla
+    return mejor
+
+
+def analizar_reglas(reglas, firewalls_por_id, por_firewall=True):
+    """
+    Hallazgos sobre `reglas` (Regla del IndicePoliticas, en orden de
+    posición). Con `por_firewall` cada firewall se analiza por separado,
+    como en la simulación por ruta; si no, todas las reglas juntas, como en
+    la simulación por reglas.
+    """
+    grupos = {}
+    hallazgos = []
+
+    for regla in reglas:
+        protocolo = _comodin(regla.protocolo)
+        puerto = _comodin(regla.puerto)
+        clave = (
+            regla.id_firewall if por_firewall else None,
+            regla.servicio,
+            (regla.tipo_origen, regla.origen),
+            (regla.tipo_destino, regla.destino),
+        )
+        grupo = grupos.get(clave)
+        if grupo is None:
+            grupo = grupos[clave] = _Grupo()
+
+        accion = _accion(regla)
+        contraria = "permitir" if accion == "denegar" else "denegar"
+
+        previa = grupo.cubre(protocolo, puerto)
+        if previa is not None:
+            tipo = "regla_redundante" if _accion(previa) == accion else "regla_sombreada"
+            hallazgos.append(_hallazgo(tipo, regla, previa, firewalls_por_id))
+        else:
+            previa = grupo.solapa(contraria, protocolo, puerto)
+            if previa is not None:
+                hallazgos.append(_hallazgo("reglas_en_conflicto", regla, previa, firewalls_por_id))
+
+        grupo.agregar(regla, protocolo, puerto)
+
+    return hallazgos
+
+
+_NIVELES = {
+    "regla_sombreada": "alto",
+    "reglas_en_conflicto": "medio",
+    "regla_redundante": "bajo",
+}
+
+
+def _describir(regla):
+    extra = ""
+    if regla.protocolo or regla.puerto:
+        extra = f" {regla.protocolo or '*'}/{regla.puerto or '*'}"
+    return (
+        f"#{regla.id_politica} ({regla.accion} {regla.servicio}{extra}: "
+        f"{regla.tipo_origen} {regla.origen} -> {regla.tipo_destino} {regla.destino})"
+    )
+
+
+def _hallazgo(tipo, regla, previa, firewalls_por_id):
+    if tipo == "regla_sombreada":
+        mensaje = (
+            f"La política {_describir(regla)} nunca se aplica: la política "
+            f"{_describir(previa)} va antes, cubre todos sus flujos y tiene la acción contraria."
+        )
+    elif tipo == "regla_redundante":
+        mensaje = (
+            f"La política {_describir(regla)} es redundante: la política "
+            f"{_describir(previa)} va antes, cubre todos sus flujos y tiene la misma acción."
+        )
+    else:
+        mensaje = (
+            f"Las políticas {_describir(previa)} y {_describir(regla)} se solapan con "
+            f"acciones contrarias; en los flujos comunes se aplica #{previa.id_politica} por ir antes."
+        )
+
+    return {
+        "tipo": tipo,
+        "nivel": _NIVELES[tipo],
+        "id_politica": regla.id_politica,
+        "id_politica_previa": previa.id_politica,
+        "firewall": firewalls_por_id.get(regla.id_firewall),
+        "mensaje": mensaje,
+    }
@@ -0,0 +1,208 @@
+"""
+Benchmark de latencia de consultas por topología (índices y PRAGMAs de SQLite).
+
+Genera una BD con varias topologías grandes y mide las consultas que hacen
+los endpoints (nodos, enlaces, políticas por servicio/firewall, páginas de
+escenarios) en dos variantes de la misma BD:
+- base:     sin índices secundarios y con los PRAGMAs por defecto de SQLite.
+- ajustada: con los índices de los modelos y los PRAGMAs de create_app.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_consultas
+    python -m benchmarks.bench_consultas --topologias 20 --nodos 2000 --politicas 20000 --escenarios 50000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app import (
+    EscenarioFlujo,
+    Enlace,
+    Nodo,
+    PoliticaSeguridad,
+    Topologia,
+    _configurar_sqlite,
+    create_app,
+    db,
+)
+
+
+def poblar(engine, n_topologias, n_nodos, n_politicas, n_escenarios, seed=0):
+    """Inserta los datos directamente con Core (no es lo que se mide)."""
+    rnd = random.Random(seed)
+    zonas = ["interna", "dmz", "externa", "gestion"]
+    servicios = ["http", "https", "dns", "ssh", "smtp", "icmp", "ntp", "ldap"]
+    lote = 5000
+
+    def insertar(conn, tabla, filas):
+        for i in range(0, len(filas), lote):
+            conn.execute(insert(tabla), filas[i:i + lote])
+
+    with engine.begin() as conn:
+        for t in range(n_topologias):
+            id_topologia = conn.execute(
+                insert(Topologia.__table__).values(nombre=f"bench_{t}")
+            ).inserted_primary_key[0]
+
+            nodos = [
+                {
+                    "id_topologia": id_topologia,
+                    "nombre": f"nodo_{i}",
+                    "tipo": "firewall" if i % 50 == 0 else "host",
+                    "zona_seguridad": rnd.choice(zonas),
+                    "posicion_x": 0.0,
+                    "posicion_y": 0.0,
+                }
+                for i in range(n_nodos)
+            ]
+            insertar(conn, Nodo.__table__, nodos)
+            ids_nodos = conn.execute(
+                select(Nodo.id_nodo).where(Nodo.id_topologia == id_topologia)
+            ).scalars().all()
+            firewalls = ids_nodos[::50]
+
+            insertar(conn, Enlace.__table__, [
+                {
+                    "id_topologia": id_topologia,
+                    "id_nodo_origen": rnd.choice(ids_nodos),
+                    "id_nodo_destino": rnd.choice(ids_nodos),
+                }
+                for _ in range(n_nodos * 2)
+            ])
+
+            def extremo():
+                if rnd.random() < 0.5:
+                    return "zona", rnd.choice(zonas)
+                return "nodo", f"nodo_{rnd.randrange(n_nodos)}"
+
+            politicas = []
+            for _ in range(n_politicas):
+                tipo_o, origen = extremo()
+                tipo_d, destino = extremo()
+                politicas.append({
+                    "id_topologia": id_topologia,
+                    "id_firewall": rnd.choice(firewalls),
+                    "tipo_origen": tipo_o,
+                    "origen": origen,
+                    "tipo_destino": tipo_d,
+                    "destino": destino,
+                    "servicio": rnd.choice(servicios),
+                    "protocolo": "tcp",
+                    "puerto": 80,
+                    "accion": rnd.choice(["permitir", "denegar"]),
+                })
+            insertar(conn, PoliticaSeguridad.__table__, politicas)
+
+            escenarios = []
+            for _ in range(n_escenarios):
+                tipo_o, origen = extremo()
+                tipo_d, destino = extremo()
+                escenarios.append({
+                    "id_topologia": id_topologia,
+                    "tipo_origen": tipo_o,
+                    "origen": origen,
+                    "tipo_destino": tipo_d,
+                    "destino": destino,
+                    "servicio": rnd.choice(servicios),
+                    "resultado": "pendiente",
+                })
+            insertar(conn, EscenarioFlujo.__table__, escenarios)
+
+
+def consultas(id_topologia, id_firewall, cursor):
+    """(nombre, sentencia) de las consultas que hacen los endpoints."""
+    return [
+        ("nodos de la topología", select(Nodo.id_nodo, Nodo.nombre, Nodo.tipo, Nodo.zona_seguridad)
+            .where(Nodo.id_topologia == id_topologia).order_by(Nodo.id_nodo)),
+        ("nodo por nombre", select(Nodo.id_nodo)
+            .where(Nodo.id_topologia == id_topologia, Nodo.nombre == "nodo_7")),
+        ("enlaces de la topología", select(Enlace.id_nodo_origen, Enlace.id_nodo_destino)
+            .where(Enlace.id_topologia == id_topologia).order_by(Enlace.id_enlace)),
+        ("políticas por servicio", select(PoliticaSeguridad.id_politica)
+            .where(PoliticaSeguridad.id_topologia == id_topologia, PoliticaSeguridad.servicio == "ssh")),
+        ("políticas de un firewall", select(PoliticaSeguridad)
+            .where(PoliticaSeguridad.id_topologia == id_topologia, PoliticaSeguridad.id_firewall == id_firewall)
+            .order_by(PoliticaSeguridad.id_politica)),
+        ("página de escenarios", select(EscenarioFlujo)
+            .where(EscenarioFlujo.id_topologia == id_topologia, EscenarioFlujo.id_escenario > cursor)
+            .order_by(EscenarioFlujo.id_escenario).limit(100)),
+        ("total de escenarios", select(func.count()).select_from(EscenarioFlujo)
+            .where(EscenarioFlujo.id_topologia == id_topologia)),
+    ]
+
+
+def medir(ruta_bd, pragmas, repeticiones):
+    engine = create_engine("sqlite:///" + ruta_bd)
+    _configurar_sqlite(engine, pragmas)
+
+    resultados = {}
+    with engine.connect() as conn:
+        topologias = conn.execute(select(Topologia.id_topologia)).scalars().all()
+        # Una topología del medio, para no favorecer las primeras filas
+        id_topologia = topologias[len(topologias) // 2]
+        id_firewall = conn.execute(
+            select(func.min(Nodo.id_nodo)).where(Nodo.id_topologia == id_topologia, Nodo.tipo == "firewall")
+        ).scalar()
+        cursor = conn.execute(
+            select(func.min(EscenarioFlujo.id_escenario)).where(EscenarioFlujo.id_topologia == id_topologia)
+        ).scalar() + 1000
+
+        for nombre, sentencia in consultas(id_topologia, id_firewall, cursor):
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                conn.execute(sentencia).all()
+                tiempos.append(time.perf_counter() - inicio)
+            resultados[nombre] = statistics.median(tiempos) * 1000
+    engine.dispose()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--topologias", type=int, default=10)
+    parser.add_argument("--nodos", type=int, default=1000)
+    parser.add_argument("--politicas", type=int, default=5000)
+    parser.add_argument("--escenarios", type=int, default=20000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ajustada = os.path.join(tmp, "ajustada.db")
+        app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite:///" + ajustada})
+        pragmas = app.config["SQLITE_PRAGMAS"]
+
+        print("Generando datos...")
+        with app.app_context():
+            poblar(db.engine, args.topologias, args.nodos, args.politicas, args.escenarios)
+            db.engine.dispose()
+
+        # Misma BD sin índices secundarios y en modo rollback journal
+        base = os.path.join(tmp, "base.db")
+        shutil.copy(ajustada, base)
+        engine = create_engine("sqlite:///" + base)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+            for tabla in db.metadata.sorted_tables:
+                for indice in tabla.indexes:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {indice.name}"))
+        engine.dispose()
+
+        t_base = medir(base, {}, args.repeticiones)
+        t_ajustada = medir(ajustada, pragmas, args.repeticiones)
+
+        print(f"{'consulta':<26} {'base (ms)':>10} {'ajustada (ms)':>14} {'mejora':>8}")
+        for nombre in t_base:
+            mejora = t_base[nombre] / t_ajustada[nombre] if t_ajustada[nombre] else float("inf")
+            print(f"{nombre:<26} {t_base[nombre]:>10.3f} {t_ajustada[nombre]:>14.3f} {mejora:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark de exportación a GNS3 contra el servidor falso local.
+
+Compara la exportación secuencial (concurrencia 1) con la paralela para
+varios tamaños de topología.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_gns3
+    python -m benchmarks.bench_gns3 --tamanos 50 300 --latencia 0.02 --concurrencias 1 8 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from benchmarks.fake_gns3 import iniciar_servidor
+from benchmarks.generador import generar_topologia
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de exportación a GNS3")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--concurrencias", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latencia", type=float, default=0.01, help="segundos por petición al GNS3 falso")
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(latencia=args.latencia)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'nodos':>6} {'enlaces':>8} {'concurrencia':>12} {'tiempo (s)':>11} {'peticiones':>11}")
+        for concurrencia in args.concurrencias:
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, f"bench_{concurrencia}.db"),
+                    "GNS3_SERVER_URL": url,
+                    "GNS3_MAX_CONCURRENCIA": concurrencia,
+                }
+            )
+            cliente = app.test_client()
+
+            for n in args.tamanos:
+                payload = generar_topologia(n, enlaces_extra_por_nodo=0)
+                id_topologia = cliente.post("/topologias", json=payload).get_json()["id_topologia"]
+
+                antes = servidor.estado.peticiones
+                inicio = time.perf_counter()
+                resp = cliente.post(f"/topologias/{id_topologia}/exportar_gns3")
+                tiempo = time.perf_counter() - inicio
+                assert resp.status_code == 201, resp.get_data(as_text=True)
+
+                peticiones = servidor.estado.peticiones - antes
+                print(f"{n:>6} {len(payload['enlaces']):>8} {concurrencia:>12} {tiempo:>11.3f} {peticiones:>11}")
+
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark de importación de topologías (POST /topologias).
+
+Mide el tiempo de crear_topologia frente al tamaño del diseño enviado
+desde el canvas (topología sintética de benchmarks.generador), usando una
+BD SQLite temporal.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_importacion
+    python -m benchmarks.bench_importacion --tamanos 100 1000 5000 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from benchmarks.generador import generar_topologia
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "bench.db")}
+        )
+        cliente = app.test_client()
+
+        print(f"{'nodos':>8} {'enlaces':>8} {'mejor (s)':>10} {'nodos/s':>10}")
+        for n in args.tamanos:
+            payload = generar_topologia(n)
+            tiempos = []
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                resp = cliente.post("/topologias", json=payload)
+                tiempos.append(time.perf_counter() - inicio)
+                assert resp.status_code == 201, resp.get_data(as_text=True)
+
+            mejor = min(tiempos)
+            print(f"{n:>8} {len(payload['enlaces']):>8} {mejor:>10.3f} {n / mejor:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
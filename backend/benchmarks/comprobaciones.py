@@ -0,0 +1,110 @@
+"""
+Comprobaciones de regresión de extremo a extremo (sin pytest).
+
+Cada comprobación monta una topología pequeña en una BD SQLite temporal,
+la ejercita con el cliente de pruebas de Flask y falla con AssertionError
+si el resultado no es el esperado. Sale con código 1 si alguna falla.
+
+Uso (desde backend/):
+    python -m benchmarks.comprobaciones
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from app import create_app, db
+
+
+TOPOLOGIA = {
+    "nombre": "comprobaciones",
+    "nodos": [
+        {"id_cliente": "h1", "nombre": "h1", "tipo": "host", "zona_seguridad": "interna"},
+        {"id_cliente": "fw", "nombre": "fw", "tipo": "firewall", "zona_seguridad": "interna"},
+        {"id_cliente": "s1", "nombre": "s1", "tipo": "servidor", "zona_seguridad": "dmz"},
+    ],
+    "enlaces": [
+        {"id_nodo_origen": "h1", "id_nodo_destino": "fw"},
+        {"id_nodo_origen": "fw", "id_nodo_destino": "s1"},
+    ],
+}
+
+
+def _peticion(cliente, metodo, url, esperado, **kwargs):
+    resp = cliente.open(url, method=metodo, **kwargs)
+    assert resp.status_code == esperado, f"{metodo} {url}: {resp.status_code} {resp.get_data(as_text=True)[:500]}"
+    return resp
+
+
+def importacion_mayusculas(cliente):
+    """tipo_origen/tipo_destino/accion en mayúsculas se guardan en minúsculas y casan en /simular."""
+    id_topologia = _peticion(cliente, "POST", "/topologias", 201, json=TOPOLOGIA).get_json()["id_topologia"]
+    base = f"/topologias/{id_topologia}"
+
+    csv_politicas = (
+        "firewall,tipo_origen,origen,tipo_destino,destino,servicio,protocolo,puerto,accion\n"
+        "fw,ZONA,interna,Zona,dmz,http,tcp,80,Denegar\n"
+        "fw,Zona,interna,ZONA,dmz,ssh,tcp,22,PERMITIR\n"
+    )
+    _peticion(cliente, "POST", f"{base}/politicas/importar", 201,
+              data=csv_politicas, headers={"Content-Type": "text/csv"})
+    # La regla de nodo, más específica, debe ganar a la de zona
+    ndjson_politicas = json.dumps({
+        "firewall": "fw", "tipo_origen": "Nodo", "origen": "h1", "tipo_destino": "NODO", "destino": "s1",
+        "servicio": "ssh", "protocolo": "tcp", "puerto": 22, "accion": "Denegar",
+    }) + "\n"
+    _peticion(cliente, "POST", f"{base}/politicas/importar", 201,
+              data=ndjson_politicas, headers={"Content-Type": "application/x-ndjson"})
+
+    politicas = _peticion(cliente, "GET", f"{base}/politicas", 200).get_json()
+    for pol in politicas:
+        assert pol["tipo_origen"] in ("zona", "nodo"), pol
+        assert pol["tipo_destino"] in ("zona", "nodo"), pol
+        assert pol["accion"] in ("permitir", "denegar"), pol
+
+    esperados = {
+        ("zona", "interna", "zona", "dmz", "http", 80): "bloqueado",
+        ("zona", "interna", "zona", "dmz", "ssh", 22): "permitido",
+        ("nodo", "h1", "nodo", "s1", "ssh", 22): "bloqueado",
+    }
+    esperado_por_id = {}
+    for (tipo_o, origen, tipo_d, destino, servicio, puerto), resultado in esperados.items():
+        id_escenario = _peticion(cliente, "POST", f"{base}/escenarios", 201, json={
+            "tipo_origen": tipo_o, "origen": origen, "tipo_destino": tipo_d, "destino": destino,
+            "servicio": servicio, "protocolo": "tcp", "puerto": puerto,
+        }).get_json()["id_escenario"]
+        esperado_por_id[id_escenario] = resultado
+
+    for modo in ("reglas", "ruta"):
+        resultados = _peticion(cliente, "POST", f"{base}/simular?modo={modo}&persistir=0", 200).get_json()
+        assert len(resultados) == len(esperados), resultados
+        for r in resultados:
+            assert r["resultado"] == esperado_por_id[r["id_escenario"]], f"modo {modo}: {r}"
+
+
+COMPROBACIONES = (importacion_mayusculas,)
+
+
+def main():
+    fallidas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for comprobacion in COMPROBACIONES:
+            app = create_app({
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, f"{comprobacion.__name__}.db"),
+                "REPORTES_CACHE_DIR": os.path.join(tmp, "reportes"),
+            })
+            try:
+                comprobacion(app.test_client())
+            except AssertionError as e:
+                fallidas += 1
+                print(f"FALLA {comprobacion.__name__}: {e}", file=sys.stderr)
+            else:
+                print(f"ok    {comprobacion.__name__}")
+            with app.app_context():
+                db.engine.dispose()
+    sys.exit(1 if fallidas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Servidor GNS3 falso para pruebas locales y benchmarks de exportación.
+
+Implementa lo mínimo de la API v2 que usa el backend (alta, consulta y baja
+de proyectos; alta, cambio y baja de nodos y enlaces) guardando todo en memoria, con una latencia artificial por
+petición para simular un servidor remoto.
+
+Uso (desde backend/):
+    python -m benchmarks.fake_gns3 --puerto 3080 --latencia 0.02
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class EstadoGNS3:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.proyectos = {}  # project_id -> {"name", "nodes": {}, "links": {}}
+        self.peticiones = 0
+        # [(método, regex de la ruta, status, cuerpo)] que se responden con error
+        self.fallos = []
+
+    def fallar(self, metodo, patron, status=500, cuerpo=None):
+        """Responde `status` a las peticiones `metodo` cuya ruta case con `patron` (pruebas)."""
+        with self.lock:
+            self.fallos.append((metodo, re.compile(patron), status, cuerpo))
+
+    def fallo_para(self, metodo, ruta):
+        with self.lock:
+            for metodo_fallo, patron, status, cuerpo in self.fallos:
+                if metodo_fallo == metodo and patron.search(ruta):
+                    return status, cuerpo
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como un servidor real
+    # Cabeceras y cuerpo en un solo envío (evita esperas por delayed ACK)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    RUTA_PROYECTOS = re.compile(r"^/v2/projects/?$")
+    RUTA_COLECCION = re.compile(r"^/v2/projects/([^/]+)/(nodes|links)/?$")
+    RUTA_ELEMENTO = re.compile(r"^/v2/projects/([^/]+)/(nodes|links)/([^/]+)/?$")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _responder(self, status, cuerpo=None):
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _leer_json(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(largo) or b"{}")
+
+    def _entrar(self):
+        """Estado del servidor, o None si ya se respondió con un fallo inyectado."""
+        estado = self.server.estado
+        with estado.lock:
+            estado.peticiones += 1
+        if self.server.latencia:
+            time.sleep(self.server.latencia)
+        fallo = estado.fallo_para(self.command, self.path)
+        if fallo is not None:
+            status, cuerpo = fallo
+            # El cuerpo de la petición se consume igualmente (keep-alive)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if isinstance(cuerpo, bytes):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+            else:
+                self._responder(status, cuerpo if cuerpo is not None else {"message": "Fallo inyectado"})
+            return None
+        return estado
+
+    def do_POST(self):
+        estado = self._entrar()
+        if estado is None:
+            return
+        payload = self._leer_json()
+
+        if self.RUTA_PROYECTOS.match(self.path):
+            with estado.lock:
+                if any(p["name"] == payload.get("name") for p in estado.proyectos.values()):
+                    return self._responder(409, {"message": "Project already exists"})
+                project_id = str(uuid.uuid4())
+                estado.proyectos[project_id] = {"name": payload.get("name"), "nodes": {}, "links": {}}
+            return self._responder(201, {"project_id": project_id, "name": payload.get("name")})
+
+        m = self.RUTA_COLECCION.match(self.path)
+        if not m or m.group(1) not in estado.proyectos:
+            return self._responder(404, {"message": "Not found"})
+
+        proyecto = estado.proyectos[m.group(1)]
+        if m.group(2) == "nodes":
+            node_id = str(uuid.uuid4())
+            with estado.lock:
+                proyecto["nodes"][node_id] = dict(payload, node_id=node_id)
+            return self._responder(201, proyecto["nodes"][node_id])
+
+        with estado.lock:
+            extremos = payload.get("nodes", [])
+            if any(n.get("node_id") not in proyecto["nodes"] for n in extremos):
+                return self._responder(404, {"message": "Node not found"})
+            link_id = str(uuid.uuid4())
+            proyecto["links"][link_id] = dict(payload, link_id=link_id)
+        return self._responder(201, proyecto["links"][link_id])
+
+    def do_GET(self):
+        estado = self._entrar()
+        if estado is None:
+            return
+        m = re.match(r"^/v2/projects/([^/]+)/?$", self.path)
+        if not m or m.group(1) not in estado.proyectos:
+            return self._responder(404, {"message": "Not found"})
+        proyecto = estado.proyectos[m.group(1)]
+        return self._responder(200, {"project_id": m.group(1), "name": proyecto["name"]})
+
+    def do_PUT(self):
+        estado = self._entrar()
+        if estado is None:
+            return
+        payload = self._leer_json()
+        m = self.RUTA_ELEMENTO.match(self.path)
+        if not m or m.group(1) not in estado.proyectos or m.group(2) != "nodes":
+            return self._responder(404, {"message": "Not found"})
+
+        nodos = estado.proyectos[m.group(1)]["nodes"]
+        with estado.lock:
+            if m.group(3) not in nodos:
+                return self._responder(404, {"message": "Node not found"})
+            nodos[m.group(3)].update(payload)
+        return self._responder(200, nodos[m.group(3)])
+
+    def do_DELETE(self):
+        estado = self._entrar()
+        if estado is None:
+            return
+        m = re.match(r"^/v2/projects/([^/]+)/?$", self.path)
+        if m:
+            with estado.lock:
+                if estado.proyectos.pop(m.group(1), None) is None:
+                    return self._responder(404, {"message": "Not found"})
+            return self._responder(204)
+
+        m = self.RUTA_ELEMENTO.match(self.path)
+        if not m or m.group(1) not in estado.proyectos:
+            return self._responder(404, {"message": "Not found"})
+
+        proyecto = estado.proyectos[m.group(1)]
+        coleccion, elemento_id = m.group(2), m.group(3)
+        with estado.lock:
+            if elemento_id not in proyecto[coleccion]:
+                return self._responder(404, {"message": "Not found"})
+            del proyecto[coleccion][elemento_id]
+            if coleccion == "nodes":
+                # Como GNS3: borrar un nodo borra sus enlaces
+                for link_id, link in list(proyecto["links"].items()):
+                    if any(n.get("node_id") == elemento_id for n in link.get("nodes", [])):
+                        del proyecto["links"][link_id]
+        return self._responder(204)
+
+
+def iniciar_servidor(host="127.0.0.1", puerto=0, latencia=0.0):
+    """
+    Arranca el servidor en un hilo daemon y devuelve (servidor, url_base).
+    Con puerto=0 el sistema elige uno libre.
+    """
+    servidor = ThreadingHTTPServer((host, puerto), _Handler)
+    servidor.daemon_threads = True
+    servidor.estado = EstadoGNS3()
+    servidor.latencia = latencia
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor GNS3 falso en memoria")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=3080)
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos por petición")
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(args.host, args.puerto, args.latencia)
+    print(f"GNS3 falso escuchando en {url} (Ctrl+C para salir)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Generador reproducible de topologías sintéticas para benchmarks.
+
+Con la misma semilla y los mismos parámetros produce siempre los mismos
+datos: nodos repartidos por zonas y segmentos (subred /24 + VLAN por
+segmento), enlaces segmento -> switch -> router de zona, firewalls entre
+zonas (así la simulación por ruta atraviesa firewalls), políticas por
+firewall y escenarios de flujo. Una pequeña fracción de nodos recibe una
+subred/VLAN de otra zona o ninguna, para que el análisis de segmentación
+tenga hallazgos.
+
+La topología sale en el formato de POST /topologias (como la envía React
+Flow), las políticas en el de /politicas/importar (firewall por nombre) y
+los escenarios en el de POST /escenarios.
+
+Uso (desde backend/):
+    python -m benchmarks.generador --nodos 1000 --seed 1 > topologia.json
+"""
+
+import argparse
+import json
+import random
+from collections import namedtuple
+
+
+ZONAS = ("interna", "dmz", "externa")
+# Peso de cada zona en el reparto de nodos
+PESOS_ZONAS = (6, 3, 1)
+
+SERVICIOS = (
+    ("http", "tcp", 80),
+    ("https", "tcp", 443),
+    ("dns", "udp", 53),
+    ("ssh", "tcp", 22),
+    ("smtp", "tcp", 25),
+    ("ntp", "udp", 123),
+    ("ldap", "tcp", 389),
+    ("icmp", None, None),
+)
+
+DatosSinteticos = namedtuple("DatosSinteticos", ["topologia", "politicas", "escenarios"])
+
+
+def generar_topologia(
+    n_nodos,
+    seed=0,
+    nodos_por_segmento=50,
+    firewall_cada=50,
+    enlaces_extra_por_nodo=0.5,
+    anomalias=0.01,
+):
+    """Payload de POST /topologias con `n_nodos` nodos (incluidos routers, switches y firewalls)."""
+    rnd = random.Random(seed)
+    nodos = []
+    enlaces = []
+
+    def nodo(tipo, zona, subred=None, vlan=None):
+        i = len(nodos)
+        nodos.append({
+            "id_cliente": f"n{i}",
+            "nombre": f"{tipo}_{i}",
+            "tipo": tipo,
+            "zona_seguridad": zona,
+            "posicion_x": round(rnd.uniform(0, 4000), 1),
+            "posicion_y": round(rnd.uniform(0, 4000), 1),
+            "subred": subred,
+            "vlan": vlan,
+        })
+        return f"n{i}"
+
+    def enlazar(origen, destino):
+        enlaces.append({"id_nodo_origen": origen, "id_nodo_destino": destino})
+
+    n_firewalls = max(1, n_nodos // firewall_cada)
+    n_resto = max(0, n_nodos - n_firewalls - len(ZONAS))
+    total_pesos = sum(PESOS_ZONAS)
+    por_zona = [n_resto * p // total_pesos for p in PESOS_ZONAS]
+    por_zona[0] += n_resto - sum(por_zona)
+
+    routers = []
+    miembros_zona = []
+    for z, (zona, n_zona) in enumerate(zip(ZONAS, por_zona)):
+        router = nodo("router", zona)
+        routers.append(router)
+        miembros = []
+        segmento = 0
+        while n_zona > 0:
+            subred = f"10.{16 * z + segmento // 256}.{segmento % 256}.0/24"
+            vlan = 100 * (z + 1) + segmento % 100
+            switch = nodo("switch", zona, subred, vlan)
+            enlazar(switch, router)
+            n_zona -= 1
+            tipo_final = "servidor" if zona == "dmz" else "host"
+            for _ in range(min(n_zona, nodos_por_segmento - 1)):
+                if rnd.random() < anomalias:
+                    # Nodo mal segmentado: subred/VLAN de otra zona o sin ellas
+                    otra = rnd.randrange(len(ZONAS))
+                    datos = rnd.choice([
+                        (f"10.{16 * otra}.0.0/24", 100 * (otra + 1)),
+                        (None, None),
+                    ])
+                else:
+                    datos = (subred, vlan)
+                miembro = nodo(rnd.choice((tipo_final, "host")), zona, *datos)
+                enlazar(miembro, switch)
+                miembros.append(miembro)
+                n_zona -= 1
+            segmento += 1
+        miembros_zona.append(miembros)
+
+    # Los routers de zona sólo se conectan entre sí a través de firewalls
+    for f in range(n_firewalls):
+        a = f % len(ZONAS)
+        b = (a + 1 + (f // len(ZONAS)) % (len(ZONAS) - 1)) % len(ZONAS)
+        firewall = nodo("firewall", ZONAS[a])
+        enlazar(routers[a], firewall)
+        enlazar(firewall, routers[b])
+
+    # Enlaces extra dentro de cada zona (redundancia)
+    for miembros in miembros_zona:
+        for _ in range(int(len(miembros) * enlaces_extra_por_nodo)):
+            if len(miembros) > 1:
+                enlazar(*rnd.sample(miembros, 2))
+
+    return {
+        "nombre": f"sintetica_{n_nodos}_s{seed}",
+        "descripcion": "Topología sintética generada por benchmarks.generador",
+        "nodos": nodos,
+        "enlaces": enlaces,
+    }
+
+
+def _extremo(rnd, nodos):
+    if rnd.random() < 0.5:
+        return "zona", rnd.choice(ZONAS)
+    return "nodo", rnd.choice(nodos)["nombre"]
+
+
+def generar_politicas(topologia, por_firewall=20, seed=0, comodines=0.2, permitir=0.7):
+    """Filas para /politicas/importar: `por_firewall` políticas por cada firewall."""
+    rnd = random.Random(seed)
+    nodos = topologia["nodos"]
+    politicas = []
+    for firewall in (n for n in nodos if n["tipo"] == "firewall"):
+        for _ in range(por_firewall):
+            tipo_o, origen = _extremo(rnd, nodos)
+            tipo_d, destino = _extremo(rnd, nodos)
+            servicio, protocolo, puerto = rnd.choice(SERVICIOS)
+            if rnd.random() < comodines:
+                protocolo, puerto = None, None
+            politicas.append({
+                "firewall": firewall["nombre"],
+                "tipo_origen": tipo_o,
+                "origen": origen,
+                "tipo_destino": tipo_d,
+                "destino": destino,
+                "servicio": servicio,
+                "protocolo": protocolo,
+                "puerto": puerto,
+                "accion": "permitir" if rnd.random() < permitir else "denegar",
+            })
+    return politicas
+
+
+def generar_escenarios(topologia, n_escenarios, seed=0):
+    """Escenarios en el formato de POST /escenarios."""
+    rnd = random.Random(seed)
+    nodos = topologia["nodos"]
+    escenarios = []
+    for _ in range(n_escenarios):
+        tipo_o, origen = _extremo(rnd, nodos)
+        tipo_d, destino = _extremo(rnd, nodos)
+        servicio, protocolo, puerto = rnd.choice(SERVICIOS)
+        escenarios.append({
+            "tipo_origen": tipo_o,
+            "origen": origen,
+            "tipo_destino": tipo_d,
+            "destino": destino,
+            "servicio": servicio,
+            "protocolo": protocolo,
+            "puerto": puerto,
+        })
+    return escenarios
+
+
+def generar(n_nodos, politicas_por_firewall=20, n_escenarios=None, seed=0):
+    """Topología, políticas y escenarios (por defecto uno por nodo) de una misma semilla."""
+    topologia = generar_topologia(n_nodos, seed=seed)
+    politicas = generar_politicas(topologia, politicas_por_firewall, seed=seed + 1)
+    escenarios = generar_escenarios(
+        topologia, n_nodos if n_escenarios is None else n_escenarios, seed=seed + 2
+    )
+    return DatosSinteticos(topologia, politicas, escenarios)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera una topología sintética (JSON)")
+    parser.add_argument("--nodos", type=int, default=100)
+    parser.add_argument("--politicas-por-firewall", type=int, default=20)
+    parser.add_argument("--escenarios", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    datos = generar(args.nodos, args.politicas_por_firewall, args.escenarios, args.seed)
+    print(json.dumps(datos._asdict(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Suite de benchmarks de los endpoints más pesados del backend.
+
+Para cada tamaño genera una topología sintética con benchmarks.generador
+(misma semilla -> mismos datos), la carga en una BD SQLite temporal y mide
+con el cliente de pruebas de Flask (sin HTTP de por medio):
+
+- crear_topologia               POST /topologias
+- obtener_topologia             GET  /topologias/<id>
+- simular_flujo                 POST /topologias/<id>/simular
+- simular_flujo_ruta            POST /topologias/<id>/simular?modo=ruta
+- vulnerabilidades_segmentacion GET  /topologias/<id>/vulnerabilidades_segmentacion
+- generar_reporte               GET  /topologias/<id>/reporte
+- exportar_topologia_a_gns3     POST /topologias/<id>/exportar_gns3 (GNS3 falso local)
+
+De cada operación se guarda la primera llamada aparte (la que compila
+índices, escribe resultados o genera el PDF; las siguientes suelen ir a
+caché) y la mediana y el mínimo de las repeticiones. El informe JSON se
+puede comparar con el de otra ejecución.
+
+Uso (desde backend/):
+    python -m benchmarks.suite --tamanos 100 1000 --salida informe.json
+    python -m benchmarks.suite --operaciones simular_flujo generar_reporte
+    python -m benchmarks.suite --comparar base.json informe.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import sqlalchemy
+from sqlalchemy import insert
+
+from app import EscenarioFlujo, create_app, db
+from benchmarks.fake_gns3 import iniciar_servidor
+from benchmarks.generador import generar
+
+
+OPERACIONES = (
+    "crear_topologia",
+    "obtener_topologia",
+    "simular_flujo",
+    "simular_flujo_ruta",
+    "vulnerabilidades_segmentacion",
+    "generar_reporte",
+    "exportar_topologia_a_gns3",
+)
+
+
+def _peticion(cliente, metodo, url, esperado, **kwargs):
+    resp = cliente.open(url, method=metodo, **kwargs)
+    # Consumimos el cuerpo (las respuestas en streaming se generan aquí)
+    resp.get_data()
+    assert resp.status_code == esperado, f"{metodo} {url}: {resp.status_code} {resp.get_data(as_text=True)[:500]}"
+    return resp
+
+
+def _cronometrar(funcion, repeticiones):
+    """Tiempos (s) de 1 + `repeticiones` llamadas a funcion()."""
+    tiempos = []
+    for _ in range(1 + repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def _resultado(operacion, n_nodos, tiempos, **extra):
+    repetidas = tiempos[1:] or tiempos
+    return {
+        "operacion": operacion,
+        "nodos": n_nodos,
+        "primera_s": tiempos[0],
+        "mediana_s": statistics.median(repetidas),
+        "min_s": min(repetidas),
+        "repeticiones": len(repetidas),
+        **extra,
+    }
+
+
+def cargar(app, cliente, datos):
+    """Crea la topología con sus políticas y escenarios; devuelve el id."""
+    id_topologia = _peticion(cliente, "POST", "/topologias", 201, json=datos.topologia).get_json()["id_topologia"]
+
+    _peticion(
+        cliente, "POST", f"/topologias/{id_topologia}/politicas/importar", 201,
+        data="".join(json.dumps(p) + "\n" for p in datos.politicas),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    # Los escenarios van directos a la BD (no es lo que se mide)
+    with app.app_context():
+        filas = [dict(e, id_topologia=id_topologia, resultado="pendiente") for e in datos.escenarios]
+        if filas:
+            db.session.execute(insert(EscenarioFlujo.__table__), filas)
+            db.session.commit()
+    return id_topologia
+
+
+def medir_tamano(app, cliente, n_nodos, args, servidor_gns3):
+    datos = generar(n_nodos, args.politicas_por_firewall, args.escenarios, seed=args.seed)
+    operaciones = args.operaciones
+    resultados = []
+
+    if "crear_topologia" in operaciones:
+        tiempos = _cronometrar(
+            lambda: _peticion(cliente, "POST", "/topologias", 201, json=datos.topologia),
+            args.repeticiones,
+        )
+        resultados.append(_resultado(
+            "crear_topologia", n_nodos, tiempos, enlaces=len(datos.topologia["enlaces"])
+        ))
+
+    id_topologia = cargar(app, cliente, datos)
+    base = f"/topologias/{id_topologia}"
+
+    medibles = {
+        "obtener_topologia": lambda: _peticion(cliente, "GET", base, 200),
+        "simular_flujo": lambda: _peticion(cliente, "POST", f"{base}/simular", 200),
+        "simular_flujo_ruta": lambda: _peticion(cliente, "POST", f"{base}/simular?modo=ruta", 200),
+        "vulnerabilidades_segmentacion": lambda: _peticion(
+            cliente, "GET", f"{base}/vulnerabilidades_segmentacion", 200
+        ),
+        "generar_reporte": lambda: _peticion(cliente, "GET", f"{base}/reporte", 200),
+    }
+    for operacion, funcion in medibles.items():
+        if operacion in operaciones:
+            tiempos = _cronometrar(funcion, args.repeticiones)
+            extra = {}
+            if operacion.startswith("simular_flujo"):
+                extra["escenarios"] = len(datos.escenarios)
+            resultados.append(_resultado(operacion, n_nodos, tiempos, **extra))
+
+    if "exportar_topologia_a_gns3" in operaciones:
+        antes = servidor_gns3.estado.peticiones
+        # Cada repetición crea un proyecto nuevo en el GNS3 falso
+        tiempos = _cronometrar(
+            lambda: _peticion(cliente, "POST", f"{base}/exportar_gns3", 201),
+            args.repeticiones,
+        )
+        peticiones = (servidor_gns3.estado.peticiones - antes) // len(tiempos)
+        resultados.append(_resultado(
+            "exportar_topologia_a_gns3", n_nodos, tiempos,
+            peticiones_gns3=peticiones, latencia_gns3_s=args.latencia_gns3,
+        ))
+
+    return resultados
+
+
+def ejecutar(args):
+    servidor, url = iniciar_servidor(latencia=args.latencia_gns3)
+    resultados = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "suite.db"),
+                "REPORTES_CACHE_DIR": os.path.join(tmp, "reportes"),
+                "GNS3_SERVER_URL": url,
+            })
+            cliente = app.test_client()
+            for n in args.tamanos:
+                print(f"Midiendo {n} nodos...", file=sys.stderr)
+                resultados.extend(medir_tamano(app, cliente, n, args, servidor))
+                with app.app_context():
+                    db.engine.dispose()
+    finally:
+        servidor.shutdown()
+
+    try:
+        import numpy
+        version_numpy = numpy.__version__
+    except ImportError:
+        version_numpy = None
+
+    return {
+        "version": 1,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "numpy": version_numpy,
+        },
+        "parametros": {
+            "tamanos": args.tamanos,
+            "seed": args.seed,
+            "repeticiones": args.repeticiones,
+            "politicas_por_firewall": args.politicas_por_firewall,
+            "escenarios": args.escenarios,
+            "latencia_gns3_s": args.latencia_gns3,
+        },
+        "resultados": resultados,
+    }
+
+
+def imprimir(informe):
+    print(f"{'operación':<30} {'nodos':>6} {'primera (ms)':>13} {'mediana (ms)':>13} {'mín (ms)':>10}")
+    for r in informe["resultados"]:
+        print(
+            f"{r['operacion']:<30} {r['nodos']:>6} {r['primera_s'] * 1000:>13.1f} "
+            f"{r['mediana_s'] * 1000:>13.1f} {r['min_s'] * 1000:>10.1f}"
+        )
+
+
+def comparar(ruta_base, ruta_nueva, tolerancia):
+    """Compara medianas de dos informes; devuelve cuántas operaciones empeoraron."""
+    with open(ruta_base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(ruta_nueva, encoding="utf-8") as f:
+        nueva = json.load(f)
+
+    if base.get("parametros") != nueva.get("parametros"):
+        print("Aviso: los informes se generaron con parámetros distintos", file=sys.stderr)
+
+    anteriores = {(r["operacion"], r["nodos"]): r for r in base["resultados"]}
+    empeoradas = 0
+    print(f"{'operación':<30} {'nodos':>6} {'base (ms)':>10} {'nueva (ms)':>11} {'cambio':>8}")
+    for r in nueva["resultados"]:
+        previa = anteriores.get((r["operacion"], r["nodos"]))
+        if previa is None:
+            continue
+        cociente = r["mediana_s"] / previa["mediana_s"] if previa["mediana_s"] else float("inf")
+        marca = ""
+        if cociente > 1 + tolerancia:
+            marca = "  peor"
+            empeoradas += 1
+        elif cociente < 1 - tolerancia:
+            marca = "  mejor"
+        print(
+            f"{r['operacion']:<30} {r['nodos']:>6} {previa['mediana_s'] * 1000:>10.1f} "
+            f"{r['mediana_s'] * 1000:>11.1f} {cociente:>7.2f}x{marca}"
+        )
+    return empeoradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks del backend")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--politicas-por-firewall", type=int, default=20)
+    parser.add_argument("--escenarios", type=int, help="escenarios por topología (por defecto, uno por nodo)")
+    parser.add_argument("--latencia-gns3", type=float, default=0.0, help="segundos por petición al GNS3 falso")
+    parser.add_argument("--operaciones", nargs="+", choices=OPERACIONES, default=list(OPERACIONES))
+    parser.add_argument("--salida", help="fichero JSON del informe (por defecto, a stdout)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"), help="compara dos informes")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="cambio relativo de la mediana a partir del que se marca (con --comparar)")
+    args = parser.parse_args()
+
+    if args.comparar:
+        # Código de salida 1 si alguna operación empeoró (útil en CI)
+        sys.exit(1 if comparar(*args.comparar, args.tolerancia) else 0)
+
+    informe = ejecutar(args)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, ensure_ascii=False, indent=2)
+        imprimir(informe)
+    else:
+        print(json.dumps(informe, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
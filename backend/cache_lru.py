@@ -0,0 +1,52 @@
+"""
+Caché LRU en memoria, acotada y segura entre hilos.
+
+Se usa para guardar estructuras compiladas por topología (p. ej. el índice
+de políticas) con claves que incluyen la revisión de la topología, de modo
+que una escritura invalida la entrada simplemente cambiando la clave.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    def __init__(self, max_entradas=128):
+        self.max_entradas = max(1, int(max_entradas))
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave, default=None):
+        with self._lock:
+            try:
+                valor = self._datos[clave]
+            except KeyError:
+                self.fallos += 1
+                return default
+            # Marcamos la entrada como usada recientemente
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def set(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            # Expulsar las menos usadas si superamos el límite
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def descartar(self, predicado):
+        """Elimina las entradas cuya clave cumpla `predicado(clave)`."""
+        with self._lock:
+            for clave in [c for c in self._datos if predicado(c)]:
+                del self._datos[clave]
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
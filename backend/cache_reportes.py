@@ -0,0 +1,109 @@
+"""
+Caché en disco de reportes PDF, direccionada por contenido.
+
+La clave es un hash de los datos que se usan para generar el reporte, así
+que dos peticiones con los mismos datos comparten el archivo y cualquier
+cambio en nodos/enlaces/políticas/escenarios produce una clave nueva.
+
+El tamaño total está acotado: al superar `max_bytes` se borran los archivos
+usados hace más tiempo (la fecha de modificación hace de marca LRU).
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+
+class CacheReportes:
+    def __init__(self, directorio, max_bytes=256 * 1024 * 1024, extension=".pdf"):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+        self.limpiar_temporales()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}{self.extension}")
+
+    def obtener(self, clave):
+        """Ruta del archivo cacheado para `clave`, o None si no está."""
+        ruta = self._ruta(clave)
+        try:
+            # Marcamos el archivo como usado recientemente
+            os.utime(ruta, None)
+        except FileNotFoundError:
+            return None
+        return ruta
+
+    def guardar(self, clave, datos):
+        """Guarda `datos` (bytes) bajo `clave` y devuelve la ruta del archivo."""
+        def escribir(tmp):
+            with open(tmp, "wb") as f:
+                f.write(datos)
+        return self.guardar_con(clave, escribir)
+
+    def guardar_con(self, clave, escribir):
+        """
+        Llama a escribir(ruta_temporal) para generar el archivo directamente
+        en disco, lo guarda bajo `clave` y devuelve la ruta definitiva.
+        """
+        ruta = self._ruta(clave)
+
+        # Escritura atómica: un lector nunca ve un PDF a medias
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        os.close(fd)
+        try:
+            escribir(tmp)
+            os.replace(tmp, ruta)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+        self._expulsar(conservar=ruta)
+        return ruta
+
+    def _expulsar(self, conservar=None):
+        """Borra los archivos menos usados hasta quedar por debajo de `max_bytes`."""
+        with self._lock:
+            archivos = []
+            total = 0
+            for entrada in os.scandir(self.directorio):
+                if not entrada.name.endswith(self.extension):
+                    continue
+                try:
+                    st = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                archivos.append((st.st_mtime, st.st_size, entrada.path))
+                total += st.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, tamano, ruta in sorted(archivos):
+                if total <= self.max_bytes:
+                    break
+                if ruta == conservar:
+                    continue
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    # En Windows no se puede borrar un archivo abierto: lo
+                    # dejamos para la próxima pasada
+                    continue
+                total -= tamano
+
+    def limpiar_temporales(self, antiguedad_segundos=3600):
+        """Elimina restos de escrituras interrumpidas."""
+        limite = time.time() - antiguedad_segundos
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".tmp") and entrada.stat().st_mtime < limite:
+                try:
+                    os.remove(entrada.path)
+                except OSError:
+                    pass
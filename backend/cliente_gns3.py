@@ -0,0 +1,71 @@
+"""
+Cliente HTTP para la API REST de GNS3.
+
+Usa una única requests.Session (keep-alive + pool de conexiones) compartida
+por los hilos que crean nodos y enlaces en paralelo.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ClienteGNS3:
+    def __init__(self, base_url, max_concurrencia=8, timeout=60, observador=None):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrencia = max(1, int(max_concurrencia))
+        self.timeout = timeout
+        # observador(method, segundos, ok) tras cada llamada (métricas)
+        self.observador = observador
+
+        self.session = requests.Session()
+        # Un slot de pool por hilo concurrente para no abrir/cerrar conexiones
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrencia)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, payload=None):
+        """
+        Llamada genérica a la API de GNS3.
+        Lanza RuntimeError si algo sale mal.
+        """
+        url = f"{self.base_url}{path}"
+        inicio = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, json=payload, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            self._observar(method, inicio, False)
+            # Incluimos el texto de respuesta si existe para depurar
+            text = ""
+            if e.response is not None:
+                try:
+                    text = e.response.text
+                except Exception:
+                    text = ""
+            raise RuntimeError(f"Error llamando a GNS3 API {url}: {e} {text}")
+        self._observar(method, inicio, True)
+
+        # Si GNS3 responde 201/200 con JSON
+        if not resp.content:
+            return {}
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise RuntimeError(f"Respuesta no JSON de GNS3 API {url}: {e} {resp.text[:200]}")
+
+    def _observar(self, method, inicio, ok):
+        if self.observador is not None:
+            self.observador(method, time.perf_counter() - inicio, ok)
+
+    def post(self, path, payload):
+        return self.request("POST", path, payload)
+
+    def executor(self):
+        """Pool de hilos acotado a `max_concurrencia` peticiones simultáneas."""
+        return ThreadPoolExecutor(max_workers=self.max_concurrencia, thread_name_prefix="gns3")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,215 @@
+"""
+Grafo de conectividad de una topología (Nodo/Enlace) y simulación por ruta.
+
+La adyacencia se guarda en formato CSR con arrays compactos:
+- `offsets[i]:offsets[i+1]` delimita los vecinos del nodo i en `vecinos`.
+- Los enlaces son bidireccionales y no tienen peso, así que la ruta más
+  corta es la de menos saltos y basta un BFS.
+
+Con 100k enlaces son dos arrays de enteros (~800 KB) en lugar de un dict de
+listas por nodo, y el recorrido no crea objetos por vecino visitado.
+
+EvaluadorRutas agrupa los escenarios por origen y hace un único BFS por
+origen para todos sus destinos, deteniéndose en cuanto los alcanza.
+"""
+
+from array import array
+
+from motor_politicas import describir_resultado
+
+
+class GrafoTopologia:
+    def __init__(self, nodos, enlaces):
+        """
+        `nodos`: filas (id_nodo, nombre, tipo, zona_seguridad).
+        `enlaces`: filas (id_nodo_origen, id_nodo_destino).
+        """
+        self.ids = [n.id_nodo for n in nodos]
+        self.nombres = [n.nombre for n in nodos]
+        self.es_firewall = bytearray(
+            (n.tipo or "").lower() == "firewall" for n in nodos
+        )
+
+        posicion = {id_nodo: i for i, id_nodo in enumerate(self.ids)}
+        self._por_nombre = {}
+        self._por_zona = {}
+        for i, n in enumerate(nodos):
+            self._por_nombre.setdefault(n.nombre, []).append(i)
+            self._por_zona.setdefault(n.zona_seguridad, []).append(i)
+
+        total = len(self.ids)
+        grado = [0] * (total + 1)
+        pares = []
+        for e in enlaces:
+            i = posicion.get(e.id_nodo_origen)
+            j = posicion.get(e.id_nodo_destino)
+            # Enlaces colgando de nodos de otra topología o bucles: no aportan rutas
+            if i is None or j is None or i == j:
+                continue
+            pares.append((i, j))
+            grado[i + 1] += 1
+            grado[j + 1] += 1
+
+        for i in range(total):
+            grado[i + 1] += grado[i]
+        self.offsets = array("i", grado)
+
+        self.vecinos = array("i", bytes(4 * grado[total]))
+        siguiente = grado[:total]
+        for i, j in pares:
+            self.vecinos[siguiente[i]] = j
+            siguiente[i] += 1
+            self.vecinos[siguiente[j]] = i
+            siguiente[j] += 1
+
+        self.num_enlaces = len(pares)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nodos_extremo(self, tipo, valor):
+        """Índices de los nodos que representa un extremo (tipo, valor) de un escenario."""
+        if tipo == "zona":
+            return self._por_zona.get(valor, ())
+        return self._por_nombre.get(valor, ())
+
+    def rutas_desde(self, fuentes, destinos):
+        """
+        BFS multi-origen desde `fuentes` (índices de nodo).
+
+        `destinos` es un dict clave -> índices de nodo. Devuelve un dict
+        clave -> ruta (lista de índices desde una fuente hasta el nodo
+        destino más cercano) o None si no hay ruta. El recorrido termina en
+        cuanto todas las claves tienen ruta.
+        """
+        rutas = dict.fromkeys(destinos)
+
+        esperando = {}
+        for clave, nodos in destinos.items():
+            for i in nodos:
+                esperando.setdefault(i, []).append(clave)
+        pendientes = sum(1 for nodos in destinos.values() if nodos)
+        if not pendientes or not fuentes:
+            return rutas
+
+        # -2: sin visitar, -1: fuente
+        padre = array("i", [-2]) * len(self.ids)
+        cola = []
+        for i in fuentes:
+            if padre[i] == -2:
+                padre[i] = -1
+                cola.append(i)
+
+        offsets = self.offsets
+        vecinos = self.vecinos
+        k = 0
+        while k < len(cola):
+            u = cola[k]
+            k += 1
+
+            claves = esperando.pop(u, None)
+            if claves:
+                for clave in claves:
+                    if rutas[clave] is None:
+                        rutas[clave] = self._camino(padre, u)
+                        pendientes -= 1
+                if not pendientes:
+                    break
+
+            for v in vecinos[offsets[u]:offsets[u + 1]]:
+                if padre[v] == -2:
+                    padre[v] = u
+                    cola.append(v)
+
+        return rutas
+
+    @staticmethod
+    def _camino(padre, destino):
+        camino = []
+        i = destino
+        while i != -1:
+            camino.append(i)
+            i = padre[i]
+        camino.reverse()
+        return camino
+
+
+class EvaluadorRutas:
+    """
+    Simulación consciente de la ruta: para cada escenario se busca el camino
+    más corto entre origen y destino y sólo se aplican las políticas cuyo
+    id_firewall es uno de los firewalls de ese camino (incluidos los
+    extremos si son firewalls). Las políticas sin firewall asociado no
+    intervienen en este modo.
+
+    - Sin ruta entre origen y destino: el flujo se considera bloqueado.
+    - Con ruta pero sin política aplicable: permitido por defecto.
+    """
+
+    def __init__(self, grafo, indice):
+        self.grafo = grafo
+        self.indice = indice
+        # ((tipo, origen), (tipo, destino)) -> (id_nodo, nombres) de los
+        # firewalls de la ruta, o None sin ruta
+        self._firewalls_ruta = {}
+
+    def evaluar_lote(self, escenarios):
+        """
+        Devuelve, en el mismo orden, (resultado, detalle, firewalls_en_ruta)
+        para cada escenario; firewalls_en_ruta es la lista de nombres o None
+        si no hay ruta.
+        """
+        escenarios = list(escenarios)
+
+        # Un BFS por origen distinto con todos sus destinos pendientes
+        por_origen = {}
+        for esc in escenarios:
+            par = ((esc.tipo_origen, esc.origen), (esc.tipo_destino, esc.destino))
+            if par not in self._firewalls_ruta:
+                por_origen.setdefault(par[0], set()).add(par[1])
+
+        for clave_o, claves_d in por_origen.items():
+            rutas = self.grafo.rutas_desde(
+                self.grafo.nodos_extremo(*clave_o),
+                {clave_d: self.grafo.nodos_extremo(*clave_d) for clave_d in claves_d},
+            )
+            for clave_d, ruta in rutas.items():
+                if ruta is None:
+                    self._firewalls_ruta[(clave_o, clave_d)] = None
+                    continue
+                firewalls = [i for i in ruta if self.grafo.es_firewall[i]]
+                # Nombres del propio grafo: un firewall sin políticas (o que el
+                # índice aún no conoce) no tiene entrada en firewalls_por_id
+                self._firewalls_ruta[(clave_o, clave_d)] = (
+                    frozenset(self.grafo.ids[i] for i in firewalls),
+                    tuple(self.grafo.nombres[i] for i in firewalls),
+                )
+
+        return [self._evaluar(esc) for esc in escenarios]
+
+    def _evaluar(self, esc):
+        en_ruta = self._firewalls_ruta[
+            ((esc.tipo_origen, esc.origen), (esc.tipo_destino, esc.destino))
+        ]
+        if en_ruta is None:
+            return (
+                "bloqueado",
+                "No existe ruta entre origen y destino en la topología",
+                None,
+            )
+
+        firewalls, nombres = en_ruta
+        nombres = list(nombres)
+        regla = self.indice.mejor_regla(esc, firewalls=firewalls)
+        if regla is None:
+            if not firewalls:
+                detalle = "La ruta no atraviesa ningún firewall: permitido por defecto"
+            else:
+                detalle = (
+                    "No se encontró política aplicable en los firewalls de la ruta "
+                    f"({', '.join(nombres)}): permitido por defecto"
+                )
+            return "permitido", detalle, nombres
+
+        resultado, detalle = describir_resultado(regla, self.indice.firewalls_por_id)
+        return resultado, detalle, nombres
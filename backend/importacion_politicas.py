@@ -0,0 +1,245 @@
+"""
+Importación/exportación masiva de políticas de seguridad (CSV o NDJSON).
+
+Cada fila se valida con un esquema compilado una sola vez (lista de
+validadores por campo) y el firewall se referencia por nombre, de modo que
+un conjunto de reglas exportado de una topología se puede importar en otra
+que tenga firewalls con los mismos nombres.
+"""
+
+import csv
+import io
+import json
+import re
+
+
+# Columnas de exportación, en este orden (también las que acepta la importación)
+CAMPOS = (
+    "firewall",
+    "tipo_origen",
+    "origen",
+    "tipo_destino",
+    "destino",
+    "servicio",
+    "protocolo",
+    "puerto",
+    "accion",
+    "descripcion",
+)
+
+# Errores por fila que se devuelven como mucho (el resto sólo se cuentan)
+MAX_ERRORES_REPORTADOS = 1000
+
+FORMATOS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class ErrorValidacion(ValueError):
+    pass
+
+
+class ErrorLectura(ValueError):
+    """Una fila ilegible (no es UTF-8) o un CSV mal formado que no se puede seguir leyendo."""
+
+    def __init__(self, fila, mensaje):
+        super().__init__(mensaje)
+        self.fila = fila
+
+
+def _vacio(valor):
+    return valor is None or (isinstance(valor, str) and not valor.strip())
+
+
+def _texto(max_len, obligatorio=False, opciones=None, default=None):
+    def validar(valor):
+        if _vacio(valor):
+            if obligatorio:
+                raise ErrorValidacion("es obligatorio")
+            return default
+        if not isinstance(valor, str):
+            valor = str(valor)
+        valor = valor.strip()
+        if len(valor) > max_len:
+            raise ErrorValidacion(f"supera {max_len} caracteres")
+        if opciones:
+            # El simulador y el análisis comparan en minúsculas ("zona", "permitir")
+            valor = valor.lower()
+            if valor not in opciones:
+                raise ErrorValidacion(f"debe ser uno de: {', '.join(opciones)}")
+        return valor
+    return validar
+
+
+def _entero(minimo, maximo):
+    def validar(valor):
+        if _vacio(valor):
+            return None
+        if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+            raise ErrorValidacion("debe ser un entero")
+        try:
+            numero = int(valor)
+        except (TypeError, ValueError, OverflowError):
+            raise ErrorValidacion("debe ser un entero")
+        if not minimo <= numero <= maximo:
+            raise ErrorValidacion(f"debe ser un entero entre {minimo} y {maximo}")
+        return numero
+    return validar
+
+
+def _texto_libre(valor):
+    return None if _vacio(valor) else str(valor)
+
+
+ESQUEMA = {
+    "id_firewall": _entero(1, 2 ** 63 - 1),
+    "firewall": _texto(100),
+    "tipo_origen": _texto(20, opciones=("zona", "nodo"), default="zona"),
+    "origen": _texto(100, obligatorio=True),
+    "tipo_destino": _texto(20, opciones=("zona", "nodo"), default="zona"),
+    "destino": _texto(100, obligatorio=True),
+    "servicio": _texto(50, obligatorio=True),
+    "protocolo": _texto(10),
+    "puerto": _entero(0, 65535),
+    "accion": _texto(20, obligatorio=True, opciones=("permitir", "denegar")),
+    "descripcion": _texto_libre,
+}
+
+
+def compilar_esquema(esquema):
+    """Devuelve validar(fila) -> (valores, errores) para un esquema campo -> validador."""
+    validadores = tuple(esquema.items())
+
+    def validar(fila):
+        valores = {}
+        errores = []
+        for campo, validador in validadores:
+            try:
+                valores[campo] = validador(fila.get(campo))
+            except ErrorValidacion as e:
+                errores.append(f"{campo}: {e}")
+        return valores, errores
+
+    return validar
+
+
+validar_politica = compilar_esquema(ESQUEMA)
+
+# Servicios de la matriz de escenarios: mismas reglas que en las políticas
+validar_servicio = compilar_esquema({campo: ESQUEMA[campo] for campo in ("servicio", "protocolo", "puerto")})
+
+
+# Bytes que no eran UTF-8 válido, conservados por errors="surrogateescape"
+_NO_UTF8 = re.compile("[\udc80-\udcff]")
+_MENSAJE_NO_UTF8 = "la fila no es UTF-8 válido"
+
+
+def _no_utf8(fila):
+    for valor in fila.values():
+        if isinstance(valor, list):
+            valor = ",".join(v for v in valor if isinstance(v, str))
+        if isinstance(valor, str) and _NO_UTF8.search(valor):
+            return True
+    return False
+
+
+def leer_filas(flujo, formato):
+    """
+    Itera (número de fila, dict o None) sobre un flujo binario sin cargarlo
+    entero. Las líneas NDJSON que no son un objeto JSON devuelven None y las
+    filas que no son UTF-8 válido, un ErrorLectura en lugar del dict. Lanza
+    ErrorLectura si el CSV está mal formado y no se puede seguir leyendo.
+    """
+    texto = io.TextIOWrapper(flujo, encoding="utf-8-sig", errors="surrogateescape", newline="")
+
+    if formato == "csv":
+        lector = csv.DictReader(texto)
+        numero = 1
+        try:
+            # La fila 1 es la cabecera
+            if lector.fieldnames and _NO_UTF8.search(",".join(lector.fieldnames)):
+                raise ErrorLectura(1, "la cabecera no es UTF-8 válido")
+            for numero, fila in enumerate(lector, start=2):
+                yield numero, ErrorLectura(numero, _MENSAJE_NO_UTF8) if _no_utf8(fila) else fila
+        except csv.Error as e:
+            raise ErrorLectura(numero + 1, f"CSV mal formado: {e}")
+        return
+
+    for numero, linea in enumerate(texto, start=1):
+        if not linea.strip():
+            continue
+        if _NO_UTF8.search(linea):
+            yield numero, ErrorLectura(numero, _MENSAJE_NO_UTF8)
+            continue
+        try:
+            fila = json.loads(linea)
+        except ValueError:
+            fila = None
+        yield numero, fila if isinstance(fila, dict) else None
+
+
+class ImportadorPoliticas:
+    """
+    Valida filas y resuelve el firewall de cada una contra los firewalls de
+    la topología destino (por nombre o por id_firewall).
+    """
+
+    def __init__(self, firewalls):
+        # firewalls: filas (id_nodo, nombre) de los nodos firewall de la topología
+        self.ids_firewall = {f.id_nodo for f in firewalls}
+        self.firewall_por_nombre = {}
+        for f in firewalls:
+            self.firewall_por_nombre.setdefault(f.nombre, f.id_nodo)
+
+    def validar(self, fila):
+        """(valores listos para insertar, errores) de una fila leída."""
+        if fila is None:
+            return None, ["la fila no es un objeto JSON"]
+        if isinstance(fila, ErrorLectura):
+            return None, [str(fila)]
+
+        valores, errores = validar_politica(fila)
+
+        nombre = valores.pop("firewall")
+        id_firewall = valores["id_firewall"]
+        if nombre is not None:
+            id_nombre = self.firewall_por_nombre.get(nombre)
+            if id_nombre is None:
+                errores.append(f"firewall: no existe un firewall '{nombre}' en la topología")
+            elif id_firewall is not None and id_firewall != id_nombre:
+                errores.append("firewall: no coincide con id_firewall")
+            valores["id_firewall"] = id_nombre
+        elif id_firewall is not None and id_firewall not in self.ids_firewall:
+            errores.append(f"id_firewall: {id_firewall} no es un firewall de la topología")
+
+        return (None if errores else valores), errores
+
+
+def exportar_filas(politicas, nombres_firewall, formato):
+    """
+    Genera el contenido de exportación por trozos. `politicas` son filas con
+    los campos de PoliticaSeguridad e id_firewall; `nombres_firewall` mapea
+    id_nodo -> nombre.
+    """
+    def a_dict(pol):
+        fila = {campo: getattr(pol, campo, None) for campo in CAMPOS[1:]}
+        return {"firewall": nombres_firewall.get(pol.id_firewall), **fila}
+
+    buffer = io.StringIO()
+    if formato == "csv":
+        escritor = csv.DictWriter(buffer, fieldnames=CAMPOS, lineterminator="\n")
+        escritor.writeheader()
+        escribir = escritor.writerow
+    else:
+        def escribir(fila):
+            buffer.write(json.dumps(fila, ensure_ascii=False) + "\n")
+
+    for numero, pol in enumerate(politicas, start=1):
+        escribir(a_dict(pol))
+        # Enviamos por trozos de 1000 filas
+        if numero % 1000 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
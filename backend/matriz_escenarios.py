@@ -0,0 +1,64 @@
+"""
+Generación de la matriz exhaustiva de escenarios de una topología.
+
+Combina todos los extremos (zonas y/o nodos) como origen y destino con todos
+los servicios (servicio, protocolo, puerto). La matriz puede tener 10^5-10^6
+combinaciones, así que se genera de forma perezosa y el llamador la consume
+por lotes (insertar + simular) sin tenerla entera en memoria.
+"""
+
+from collections import namedtuple
+from itertools import product
+
+
+EscenarioGenerado = namedtuple(
+    "EscenarioGenerado",
+    ["tipo_origen", "origen", "tipo_destino", "destino", "servicio", "protocolo", "puerto"],
+)
+
+
+def extremos_topologia(nodos, tipos=("zona", "nodo")):
+    """
+    Extremos (tipo, valor) de la topología en orden de alta de los nodos:
+    primero las zonas distintas y después los nombres de nodo distintos.
+    `nodos` son filas con nombre y zona_seguridad.
+    """
+    zonas = {}
+    nombres = {}
+    for n in nodos:
+        if n.zona_seguridad:
+            zonas.setdefault(("zona", n.zona_seguridad), None)
+        if n.nombre:
+            nombres.setdefault(("nodo", n.nombre), None)
+
+    extremos = []
+    if "zona" in tipos:
+        extremos.extend(zonas)
+    if "nodo" in tipos:
+        extremos.extend(nombres)
+    return extremos
+
+
+def servicios_politicas(politicas):
+    """(servicio, protocolo, puerto) distintos de las políticas, en orden."""
+    servicios = {}
+    for pol in politicas:
+        if pol.servicio:
+            servicios.setdefault((pol.servicio, pol.protocolo or None, pol.puerto or None), None)
+    return list(servicios)
+
+
+def total_combinaciones(extremos, servicios, incluir_mismo_extremo=False):
+    pares = len(extremos) ** 2
+    if not incluir_mismo_extremo:
+        pares -= len(extremos)
+    return pares * len(servicios)
+
+
+def generar_matriz(extremos, servicios, incluir_mismo_extremo=False):
+    """Iterador perezoso de EscenarioGenerado (origen x destino x servicio)."""
+    for (tipo_o, origen), (tipo_d, destino) in product(extremos, repeat=2):
+        if not incluir_mismo_extremo and (tipo_o, origen) == (tipo_d, destino):
+            continue
+        for servicio, protocolo, puerto in servicios:
+            yield EscenarioGenerado(tipo_o, origen, tipo_d, destino, servicio, protocolo, puerto)
@@ -0,0 +1,241 @@
+"""
+Métricas de la API en el formato de texto de Prometheus, sin dependencias.
+
+Cada proceso acumula contadores, histogramas y gauges en memoria. Con varios
+workers (gunicorn -w N) cada uno vuelca sus valores a un fichero por pid en
+un directorio compartido y /metrics suma los de todos los ficheros, así que
+da igual qué worker atienda el scrape. Cada proceso vuelca como mucho una
+vez por `intervalo` segundos (y siempre al responder /metrics y al salir),
+de modo que los valores de los otros workers pueden ir ese tiempo por detrás.
+
+Los contadores e histogramas de procesos que ya terminaron se siguen sumando
+(un contador no debe bajar); los gauges sólo cuentan los procesos vivos.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+
+# Límites (s) por defecto de los histogramas de duración
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+# Registros creados en este proceso (para reiniciarlos tras un fork)
+_registros = weakref.WeakSet()
+
+
+def _clave(etiquetas):
+    return tuple(sorted(etiquetas.items())) if etiquetas else ()
+
+
+def _vivo(pid):
+    if os.name == "nt":
+        # os.kill(pid, 0) no es una consulta en Windows: los damos por vivos
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _numero(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor)
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas_texto(clave, extra=()):
+    pares = list(clave) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+class RegistroMetricas:
+    def __init__(self, directorio=None, intervalo=1.0):
+        self.directorio = directorio
+        self.intervalo = intervalo
+        # nombre -> (tipo, ayuda, buckets)
+        self._definiciones = {}
+        # nombre -> {etiquetas: valor}; en los histogramas el valor es
+        # [n por bucket..., n por encima del último, suma]
+        self._valores = {}
+        self._lock = threading.Lock()
+        self._ultimo_volcado = 0.0
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        _registros.add(self)
+
+    # ---- definición ----
+
+    def contador(self, nombre, ayuda):
+        self._definir(nombre, "counter", ayuda)
+
+    def gauge(self, nombre, ayuda):
+        self._definir(nombre, "gauge", ayuda)
+
+    def histograma(self, nombre, ayuda, buckets=BUCKETS_SEGUNDOS):
+        self._definir(nombre, "histogram", ayuda, tuple(sorted(buckets)))
+
+    def _definir(self, nombre, tipo, ayuda, buckets=None):
+        self._definiciones[nombre] = (tipo, ayuda, buckets)
+        self._valores.setdefault(nombre, {})
+
+    # ---- actualización ----
+
+    def incrementar(self, nombre, valor=1, etiquetas=None):
+        clave = _clave(etiquetas)
+        with self._lock:
+            serie = self._valores[nombre]
+            serie[clave] = serie.get(clave, 0) + valor
+
+    # Los gauges se suben y bajan con el mismo método
+    ajustar = incrementar
+
+    def observar(self, nombre, valor, etiquetas=None):
+        buckets = self._definiciones[nombre][2]
+        clave = _clave(etiquetas)
+        with self._lock:
+            serie = self._valores[nombre]
+            h = serie.get(clave)
+            if h is None:
+                h = serie[clave] = [0] * (len(buckets) + 1) + [0.0]
+            h[bisect.bisect_left(buckets, valor)] += 1
+            h[-1] += valor
+
+    def reiniciar(self):
+        """Vacía los valores (p. ej. en el hijo tras un fork, que hereda los del padre)."""
+        with self._lock:
+            for serie in self._valores.values():
+                serie.clear()
+            self._ultimo_volcado = 0.0
+
+    # ---- multiproceso ----
+
+    def _ruta(self, pid):
+        return os.path.join(self.directorio, f"metricas_{pid}.json")
+
+    def _copia(self):
+        with self._lock:
+            return {
+                nombre: [[list(clave), list(v) if isinstance(v, list) else v] for clave, v in serie.items()]
+                for nombre, serie in self._valores.items()
+            }
+
+    def volcar(self, forzar=False):
+        """Escribe los valores de este proceso en su fichero (si hay directorio)."""
+        if not self.directorio:
+            return
+        ahora = time.monotonic()
+        if not forzar and ahora - self._ultimo_volcado < self.intervalo:
+            return
+        self._ultimo_volcado = ahora
+
+        datos = {"pid": os.getpid(), "valores": self._copia()}
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, prefix=".metricas_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+            # Reemplazo atómico: quien lee nunca ve un fichero a medias
+            os.replace(tmp, self._ruta(os.getpid()))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _procesos(self):
+        """(pid, valores) de este proceso y de los ficheros de los demás."""
+        pid_propio = os.getpid()
+        yield pid_propio, self._copia()
+        if not self.directorio:
+            return
+        for nombre in os.listdir(self.directorio):
+            if not (nombre.startswith("metricas_") and nombre.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directorio, nombre), encoding="utf-8") as f:
+                    datos = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if datos.get("pid") != pid_propio:
+                yield datos.get("pid"), datos.get("valores", {})
+
+    # ---- exposición ----
+
+    def exponer(self):
+        """Texto para /metrics con los valores sumados de todos los procesos."""
+        self.volcar(forzar=True)
+
+        agregados = {nombre: {} for nombre in self._definiciones}
+        for pid, valores in self._procesos():
+            vivo = None
+            for nombre, serie in valores.items():
+                definicion = self._definiciones.get(nombre)
+                if definicion is None:
+                    continue
+                tipo, _ayuda, buckets = definicion
+                if tipo == "gauge":
+                    if vivo is None:
+                        vivo = pid == os.getpid() or _vivo(pid)
+                    if not vivo:
+                        continue
+                destino = agregados[nombre]
+                for clave, valor in serie:
+                    clave = tuple(tuple(par) for par in clave)
+                    if tipo == "histogram":
+                        if len(valor) != len(buckets) + 2:
+                            continue
+                        actual = destino.setdefault(clave, [0] * len(valor))
+                        for i, v in enumerate(valor):
+                            actual[i] += v
+                    else:
+                        destino[clave] = destino.get(clave, 0) + valor
+
+        lineas = []
+        for nombre, (tipo, ayuda, buckets) in self._definiciones.items():
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for clave, valor in sorted(agregados[nombre].items()):
+                if tipo != "histogram":
+                    lineas.append(f"{nombre}{_etiquetas_texto(clave)} {_numero(valor)}")
+                    continue
+                acumulado = 0
+                for limite, n in zip(buckets + (float("inf"),), valor):
+                    acumulado += n
+                    le = (("le", _numero(float(limite))),)
+                    lineas.append(f"{nombre}_bucket{_etiquetas_texto(clave, le)} {acumulado}")
+                lineas.append(f"{nombre}_sum{_etiquetas_texto(clave)} {_numero(valor[-1])}")
+                lineas.append(f"{nombre}_count{_etiquetas_texto(clave)} {acumulado}")
+        return "\n".join(lineas) + "\n"
+
+
+def _reiniciar_registros():
+    for registro in list(_registros):
+        registro.reiniciar()
+
+
+def _volcar_registros():
+    for registro in list(_registros):
+        registro.volcar(forzar=True)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_registros)
+atexit.register(_volcar_registros)
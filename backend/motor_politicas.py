@@ -0,0 +1,200 @@
+"""
+Motor de evaluación de políticas de seguridad (ACLs) para la simulación de flujos.
+
+Las PoliticaSeguridad de una topología se compilan una sola vez en un índice:
+- Reglas agrupadas por (servicio, (tipo, origen), (tipo, destino)).
+- Dentro de cada grupo, sub-grupos por (protocolo, puerto).
+- Diccionario nombre de nodo -> zona de seguridad.
+
+Así cada escenario sólo revisa las reglas candidatas en lugar de todas.
+"""
+
+from collections import namedtuple
+
+
+Regla = namedtuple(
+    "Regla",
+    [
+        "posicion",       # orden original de la política (desempate)
+        "id_politica",
+        "id_firewall",
+        "tipo_origen",
+        "origen",
+        "tipo_destino",
+        "destino",
+        "servicio",
+        "protocolo",
+        "puerto",
+        "accion",
+    ],
+)
+
+
+def _comodin(valor):
+    """Protocolo/puerto vacío (None, "", 0) se comporta como comodín."""
+    return valor or None
+
+
+def _score(tipo_origen, tipo_destino):
+    """Especificidad de una regla: cada extremo por nodo suma 1."""
+    score = 0
+    if tipo_origen == "nodo":
+        score += 1
+    if tipo_destino == "nodo":
+        score += 1
+    return score
+
+
+class IndicePoliticas:
+    """
+    Índice compilado de las políticas de una topología.
+
+    Devuelve exactamente la misma política ganadora que el recorrido
+    completo: mayor especificidad y, a igualdad, la primera en orden.
+    """
+
+    def __init__(self, politicas, nodos):
+        # nombre de nodo -> zona (se queda con el primero, igual que antes)
+        self.zona_por_nodo = {}
+        # id_nodo -> nombre, sólo firewalls (para el detalle)
+        self.firewalls_por_id = {}
+
+        for n in nodos:
+            self.zona_por_nodo.setdefault(n.nombre, n.zona_seguridad)
+            if (n.tipo or "").lower() == "firewall":
+                self.firewalls_por_id[n.id_nodo] = n.nombre
+
+        # (servicio, clave_origen, clave_destino) -> {(protocolo, puerto): [reglas]}
+        self._grupos = {}
+        self.reglas = []
+        # EvaluadorVectorizado, compilado la primera vez que se evalúa un lote grande
+        self._vectorizado = None
+
+        for posicion, pol in enumerate(politicas):
+            regla = Regla(
+                posicion,
+                pol.id_politica,
+                pol.id_firewall,
+                pol.tipo_origen,
+                pol.origen,
+                pol.tipo_destino,
+                pol.destino,
+                pol.servicio,
+                pol.protocolo,
+                pol.puerto,
+                pol.accion,
+            )
+            self.reglas.append(regla)
+
+            clave = (
+                regla.servicio,
+                (regla.tipo_origen, regla.origen),
+                (regla.tipo_destino, regla.destino),
+            )
+            sub = (_comodin(regla.protocolo), _comodin(regla.puerto))
+            self._grupos.setdefault(clave, {}).setdefault(sub, []).append(regla)
+
+    def claves(self, tipo, valor):
+        """Claves (tipo, valor) con las que un extremo del escenario puede matchear."""
+        claves = [(tipo, valor)]
+        # Si el escenario es por nodo, también agregamos su zona como posible match
+        if tipo == "nodo":
+            zona = self.zona_por_nodo.get(valor)
+            if zona:
+                claves.append(("zona", zona))
+        return claves
+
+    def _candidatas(self, subgrupos, protocolo, puerto):
+        """Listas de reglas de un grupo compatibles con el protocolo/puerto del escenario."""
+        protocolo = _comodin(protocolo)
+        puerto = _comodin(puerto)
+
+        if protocolo and puerto:
+            for sub in ((None, None), (None, puerto), (protocolo, None), (protocolo, puerto)):
+                reglas = subgrupos.get(sub)
+                if reglas:
+                    yield reglas
+            return
+
+        for (p_proto, p_puerto), reglas in subgrupos.items():
+            if p_proto and protocolo and p_proto != protocolo:
+                continue
+            if p_puerto and puerto and p_puerto != puerto:
+                continue
+            yield reglas
+
+    def mejor_regla(self, esc, firewalls=None):
+        """
+        Devuelve la Regla ganadora para el escenario (o None).
+        Con `firewalls` (conjunto de id_nodo) sólo cuentan las reglas
+        asociadas a alguno de esos firewalls.
+        """
+        mejor = None
+        mejor_orden = None
+
+        for clave_o in self.claves(esc.tipo_origen, esc.origen):
+            for clave_d in self.claves(esc.tipo_destino, esc.destino):
+                subgrupos = self._grupos.get((esc.servicio, clave_o, clave_d))
+                if not subgrupos:
+                    continue
+
+                score = _score(clave_o[0], clave_d[0])
+                for reglas in self._candidatas(subgrupos, esc.protocolo, esc.puerto):
+                    # Dentro de una lista todas matchean igual: gana la primera
+                    if firewalls is None:
+                        regla = reglas[0]
+                    else:
+                        regla = next((r for r in reglas if r.id_firewall in firewalls), None)
+                        if regla is None:
+                            continue
+                    orden = (-score, regla.posicion)
+                    if mejor_orden is None or orden < mejor_orden:
+                        mejor_orden = orden
+                        mejor = regla
+
+        return mejor
+
+    def evaluar(self, esc):
+        """Devuelve (resultado, detalle) para un escenario."""
+        return describir_resultado(self.mejor_regla(esc), self.firewalls_por_id)
+
+    def evaluar_lote(self, escenarios, vectorizar_desde=256):
+        """
+        Lista de (resultado, detalle) para varios escenarios. A partir de
+        `vectorizar_desde` escenarios (0 = nunca) y si NumPy está instalado,
+        se evalúan todos a la vez con el evaluador vectorizado.
+        """
+        if vectorizar_desde and len(escenarios) >= vectorizar_desde:
+            vectorizado = self._evaluador_vectorizado()
+            if vectorizado is not None:
+                return vectorizado.evaluar_lote(escenarios)
+        return [self.evaluar(esc) for esc in escenarios]
+
+    def _evaluador_vectorizado(self):
+        if self._vectorizado is None:
+            # Import diferido: motor_vectorizado depende de este módulo
+            import motor_vectorizado
+
+            if not motor_vectorizado.disponible():
+                return None
+            self._vectorizado = motor_vectorizado.EvaluadorVectorizado(self)
+        return self._vectorizado if self._vectorizado.viable else None
+
+
+def describir_resultado(regla, firewalls_por_id):
+    """Traduce la regla ganadora en (resultado, detalle) para EscenarioFlujo."""
+    if regla is None:
+        # Política por defecto: permitido
+        return "permitido", "No se encontró política aplicable: permitido por defecto"
+
+    fw_nombre = firewalls_por_id.get(regla.id_firewall)
+    fw_label = f" en el firewall {fw_nombre}" if fw_nombre is not None else " en el firewall lógico de la topología"
+
+    reglas_txt = (
+        f"#{regla.id_politica}{fw_label} "
+        f"({regla.tipo_origen} {regla.origen} -> "
+        f"{regla.tipo_destino} {regla.destino})"
+    )
+    if regla.accion.lower() == "denegar":
+        return "bloqueado", f"Bloqueado por política {reglas_txt}"
+    return "permitido", f"Permitido por política {reglas_txt}"
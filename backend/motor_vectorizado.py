@@ -0,0 +1,228 @@
+"""
+Evaluación vectorizada (NumPy) de muchos escenarios a la vez.
+
+Las reglas de un IndicePoliticas se codifican como enteros (servicio, clave
+de origen, clave de destino, protocolo, puerto) y su orden de prioridad como
+un único rango = (2 - score) * n_reglas + posicion, de forma que el mínimo
+rango es exactamente la regla ganadora del motor por escenario (mayor
+especificidad y, a igualdad, la primera).
+
+Como un protocolo/puerto vacío es comodín en ambos lados, se precalculan
+cuatro tablas ordenadas con el rango mínimo por clave compuesta:
+- (servicio, origen, destino, protocolo, puerto)  escenario con ambos
+- (servicio, origen, destino, puerto)             escenario sin protocolo
+- (servicio, origen, destino, protocolo)          escenario sin puerto
+- (servicio, origen, destino)                     escenario sin ninguno
+y cada escenario consulta con searchsorted sus combinaciones de claves
+(nodo y zona del nodo) y de comodines, quedándose con el mínimo.
+
+NumPy es opcional: sin él `disponible()` devuelve False y se usa el índice.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+from motor_politicas import _comodin, _score, describir_resultado
+
+
+# Las claves compuestas se empaquetan en un int64
+_MAX_CLAVE = 2 ** 62
+
+
+def disponible():
+    return np is not None
+
+
+class _Vocabulario(dict):
+    """valor -> código entero (desde `inicio`), asignado en orden de aparición."""
+
+    def __init__(self, inicio=0):
+        super().__init__()
+        self.inicio = inicio
+
+    def codigo(self, valor):
+        codigo = self.get(valor)
+        if codigo is None:
+            codigo = self[valor] = len(self) + self.inicio
+        return codigo
+
+
+class _Tabla:
+    """Claves compuestas ordenadas y rango mínimo de cada una."""
+
+    def __init__(self, claves, rangos):
+        self.claves, inversa = np.unique(claves, return_inverse=True)
+        self.minimos = np.full(len(self.claves), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(self.minimos, inversa, rangos)
+
+    def buscar(self, consultas, validas):
+        """Rango mínimo para cada consulta (o el máximo int64 si no hay regla)."""
+        sin_regla = np.iinfo(np.int64).max
+        if not len(self.claves):
+            return np.full(len(consultas), sin_regla, dtype=np.int64)
+        pos = np.searchsorted(self.claves, consultas)
+        pos_ok = np.minimum(pos, len(self.claves) - 1)
+        encontradas = validas & (self.claves[pos_ok] == consultas)
+        return np.where(encontradas, self.minimos[pos_ok], sin_regla)
+
+
+class EvaluadorVectorizado:
+    """
+    Evaluador por lotes equivalente a IndicePoliticas.evaluar. Se compila una
+    vez por índice (y por tanto por revisión de la topología).
+    """
+
+    def __init__(self, indice):
+        self.indice = indice
+        self.n_reglas = len(indice.reglas)
+
+        self._servicios = _Vocabulario()
+        self._extremos = _Vocabulario()
+        # 0 es el comodín; el último código queda libre para valores que
+        # ninguna regla usa (sólo pueden casar con reglas comodín)
+        self._protocolos = _Vocabulario(inicio=1)
+        self._puertos = _Vocabulario(inicio=1)
+
+        columnas = {"s": [], "o": [], "d": [], "p": [], "t": [], "r": []}
+        for regla in indice.reglas:
+            protocolo = _comodin(regla.protocolo)
+            puerto = _comodin(regla.puerto)
+            columnas["s"].append(self._servicios.codigo(regla.servicio))
+            columnas["o"].append(self._extremos.codigo((regla.tipo_origen, regla.origen)))
+            columnas["d"].append(self._extremos.codigo((regla.tipo_destino, regla.destino)))
+            columnas["p"].append(0 if protocolo is None else self._protocolos.codigo(protocolo))
+            columnas["t"].append(0 if puerto is None else self._puertos.codigo(puerto))
+            columnas["r"].append(
+                (2 - _score(regla.tipo_origen, regla.tipo_destino)) * self.n_reglas + regla.posicion
+            )
+
+        self._base_s = len(self._servicios) + 1
+        self._base_e = len(self._extremos) + 1
+        self._base_p = len(self._protocolos) + 2
+        self._base_t = len(self._puertos) + 2
+        self.viable = (
+            self._base_s * self._base_e ** 2 * self._base_p * self._base_t < _MAX_CLAVE
+        )
+        if not self.viable:
+            return
+
+        s, o, d, p, t = (np.asarray(columnas[c], dtype=np.int64) for c in "sodpt")
+        rangos = np.asarray(columnas["r"], dtype=np.int64)
+        self._completa = _Tabla(self._clave(s, o, d, p, t), rangos)
+        self._sin_protocolo = _Tabla(self._clave(s, o, d, 0, t), rangos)
+        self._sin_puerto = _Tabla(self._clave(s, o, d, p, 0), rangos)
+        self._sin_ambos = _Tabla(self._clave(s, o, d, 0, 0), rangos)
+
+    def _clave(self, s, o, d, p, t):
+        return (((s * self._base_e + o) * self._base_e + d) * self._base_p + p) * self._base_t + t
+
+    def _codificar(self, escenarios):
+        """Arrays de códigos de los escenarios; -1 en extremos/servicios sin reglas."""
+        zona_por_nodo = self.indice.zona_por_nodo
+        servicios = self._servicios
+        protocolos = self._protocolos
+        puertos = self._puertos
+        libre_p = self._base_p - 1
+        libre_t = self._base_t - 1
+
+        # Los extremos se repiten mucho entre escenarios: se codifican una vez
+        extremos = {}
+
+        def claves(tipo, valor):
+            par = extremos.get((tipo, valor))
+            if par is None:
+                par = extremos[(tipo, valor)] = self._claves_extremo(tipo, valor, zona_por_nodo)
+            return par
+
+        s, o, d, p, t = [], [], [], [], []
+        for esc in escenarios:
+            s.append(servicios.get(esc.servicio, -1))
+            o.append(claves(esc.tipo_origen, esc.origen))
+            d.append(claves(esc.tipo_destino, esc.destino))
+
+            protocolo = _comodin(esc.protocolo)
+            puerto = _comodin(esc.puerto)
+            p.append(0 if protocolo is None else protocolos.get(protocolo, libre_p))
+            t.append(0 if puerto is None else puertos.get(puerto, libre_t))
+
+        return (
+            np.array(s, dtype=np.int64),
+            np.array(o, dtype=np.int64).reshape(-1, 2),
+            np.array(d, dtype=np.int64).reshape(-1, 2),
+            np.array(p, dtype=np.int64),
+            np.array(t, dtype=np.int64),
+        )
+
+    def _claves_extremo(self, tipo, valor, zona_por_nodo):
+        """Misma lógica que IndicePoliticas.claves: el nodo y, si tiene, su zona."""
+        propia = self._extremos.get((tipo, valor), -1)
+        zona = -1
+        if tipo == "nodo":
+            z = zona_por_nodo.get(valor)
+            if z:
+                zona = self._extremos.get(("zona", z), -1)
+        return propia, zona
+
+    def mejores_posiciones(self, escenarios):
+        """Posición (en indice.reglas) de la regla ganadora por escenario, o -1."""
+        sin_regla = np.iinfo(np.int64).max
+        if not len(escenarios):
+            return np.empty(0, dtype=np.int64)
+        if not self.n_reglas:
+            return np.full(len(escenarios), -1, dtype=np.int64)
+
+        s, o, d, p, t = self._codificar(escenarios)
+        con_p = p != 0
+        con_t = t != 0
+
+        # Según qué comodines tenga el escenario se consulta una tabla u
+        # otra, con sus combinaciones (valor concreto / comodín de la regla)
+        casos = [
+            (con_p & con_t, self._completa, [(True, True), (False, True), (True, False), (False, False)]),
+            (~con_p & con_t, self._sin_protocolo, [(False, True), (False, False)]),
+            (con_p & ~con_t, self._sin_puerto, [(True, False), (False, False)]),
+            (~con_p & ~con_t, self._sin_ambos, [(False, False)]),
+        ]
+
+        mejor = np.full(len(escenarios), sin_regla, dtype=np.int64)
+        for caso, tabla, combinaciones in casos:
+            filas = np.flatnonzero(caso & (s >= 0))
+            if not filas.size:
+                continue
+            s_c, p_c, t_c = s[filas], p[filas], t[filas]
+            mejor_c = mejor[filas]
+
+            # Origen/destino por su propia clave y por la zona del nodo
+            for i in range(2):
+                for j in range(2):
+                    o_c = o[filas, i]
+                    d_c = d[filas, j]
+                    validas = (o_c >= 0) & (d_c >= 0)
+                    if not validas.any():
+                        continue
+                    for usa_p, usa_t in combinaciones:
+                        claves = self._clave(
+                            s_c, o_c, d_c, p_c if usa_p else 0, t_c if usa_t else 0
+                        )
+                        np.minimum(mejor_c, tabla.buscar(claves, validas), out=mejor_c)
+
+            mejor[filas] = mejor_c
+
+        return np.where(mejor == sin_regla, -1, mejor % self.n_reglas)
+
+    def evaluar_lote(self, escenarios):
+        """Lista de (resultado, detalle), en el mismo orden que `escenarios`."""
+        reglas = self.indice.reglas
+        firewalls = self.indice.firewalls_por_id
+        textos = {}
+        resultados = []
+        for pos in self.mejores_posiciones(escenarios).tolist():
+            texto = textos.get(pos)
+            if texto is None:
+                texto = textos[pos] = describir_resultado(
+                    reglas[pos] if pos >= 0 else None, firewalls
+                )
+            resultados.append(texto)
+        return resultados
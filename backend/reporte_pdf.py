@@ -0,0 +1,291 @@
+"""
+Motor del reporte PDF con platypus (tablas que se parten solas entre páginas).
+
+Cada sección es un iterador de flowables que se genera a partir de filas
+leídas por lotes de la BD, y la historia que consume doc.build se rellena
+desde esos iteradores a medida que avanza la paginación: nunca están en
+memoria todas las filas ni todos los flowables, sólo la página en curso y
+las ya terminadas (que ReportLab guarda comprimidas hasta escribir el
+archivo). El PDF se escribe directamente en un archivo.
+
+Los iconos del diagrama se cargan (y reducen) una vez por proceso en
+IconosDiagrama y se incrustan una vez por documento como form XObject, que
+cada nodo reutiliza.
+
+Las filas se agrupan en tablas de FILAS_POR_TABLA filas: partir una tabla
+entre páginas vuelve a medir todas las filas que quedan, así que tablas
+cortas mantienen el coste lineal en el número de filas.
+"""
+
+import os
+import threading
+from xml.sax.saxutils import escape
+
+from PIL import Image
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+
+# Secciones del reporte, en el orden en que aparecen
+SECCIONES = ("diagrama", "nodos", "enlaces", "politicas", "escenarios", "segmentacion")
+
+FILAS_POR_TABLA = 100
+
+MARGEN = 15 * mm
+ANCHO_UTIL = A4[0] - 2 * MARGEN
+
+_estilos = getSampleStyleSheet()
+ESTILO_TITULO = ParagraphStyle("titulo", parent=_estilos["Title"], fontSize=16, leading=20)
+ESTILO_SECCION = ParagraphStyle(
+    "seccion", parent=_estilos["Heading2"], fontSize=12, leading=15, spaceBefore=10, keepWithNext=1
+)
+ESTILO_TEXTO = ParagraphStyle("texto", parent=_estilos["Normal"], fontSize=10, leading=13)
+
+_FUENTE = "Helvetica"
+_TAMANO = 7.5
+_RELLENO = 3
+
+_ESTILO_TABLA = [
+    ("FONT", (0, 0), (-1, -1), _FUENTE, _TAMANO, _TAMANO + 1.5),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+    ("LEFTPADDING", (0, 0), (-1, -1), _RELLENO),
+    ("RIGHTPADDING", (0, 0), (-1, -1), _RELLENO),
+    ("TOPPADDING", (0, 0), (-1, -1), 1.5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 1.5),
+]
+_ESTILO_ENCABEZADO = _ESTILO_TABLA + [
+    ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", _TAMANO, _TAMANO + 1.5),
+    ("BACKGROUND", (0, 0), (-1, 0), colors.Color(0.9, 0.92, 0.95)),
+]
+
+
+def parsear_secciones(texto):
+    """
+    Secciones pedidas en ?secciones= (separadas por comas), en el orden del
+    reporte. Vacío o None = todas. Lanza ValueError si alguna no existe.
+    """
+    if not texto:
+        return SECCIONES
+    pedidas = {s.strip().lower() for s in texto.split(",") if s.strip()}
+    desconocidas = pedidas - set(SECCIONES)
+    if desconocidas:
+        raise ValueError(
+            f"Secciones desconocidas: {', '.join(sorted(desconocidas))}. "
+            f"Válidas: {', '.join(SECCIONES)}"
+        )
+    return tuple(s for s in SECCIONES if s in pedidas) or SECCIONES
+
+
+def tablas(encabezado, filas, anchos, envolver=(), filas_por_tabla=FILAS_POR_TABLA):
+    """
+    Genera tablas de como mucho `filas_por_tabla` filas con las `filas`
+    (secuencias de valores); la primera lleva `encabezado`, que se repite si
+    se parte entre páginas. `anchos` son fracciones del ancho útil y las
+    columnas de `envolver` se parten en varias líneas en vez de recortarse.
+    """
+    anchos = [ANCHO_UTIL * a for a in anchos]
+    # Texto plano partido con simpleSplit: mucho más barato que un Paragraph por celda
+    envolver = {i: anchos[i] - 2 * _RELLENO for i in envolver}
+
+    def celdas(fila):
+        salida = []
+        for i, valor in enumerate(fila):
+            texto = "" if valor is None else str(valor)
+            ancho = envolver.get(i)
+            if ancho is not None and texto:
+                texto = "\n".join(simpleSplit(texto, _FUENTE, _TAMANO, ancho))
+            salida.append(texto)
+        return salida
+
+    lote = [list(encabezado)]
+    primera = True
+    for fila in filas:
+        lote.append(celdas(fila))
+        if len(lote) >= filas_por_tabla:
+            yield _tabla(lote, anchos, primera)
+            lote = []
+            primera = False
+    if lote and (len(lote) > 1 or not primera):
+        yield _tabla(lote, anchos, primera)
+
+
+def _tabla(filas, anchos, con_encabezado):
+    tabla = Table(filas, colWidths=anchos, repeatRows=1 if con_encabezado else 0)
+    tabla.setStyle(TableStyle(_ESTILO_ENCABEZADO if con_encabezado else _ESTILO_TABLA))
+    return tabla
+
+
+class Diagrama(Flowable):
+    """Área de `alto` puntos en la que dibujar(canvas, x, y, ancho, alto) pinta el esquema."""
+
+    def __init__(self, dibujar, alto):
+        super().__init__()
+        self.dibujar = dibujar
+        self.alto = alto
+
+    def wrap(self, ancho_disponible, _alto_disponible):
+        self.ancho = ancho_disponible
+        return ancho_disponible, self.alto
+
+    def draw(self):
+        # Margen interior para que los recuadros de los nodos de los bordes no se salgan
+        self.dibujar(self.canv, 45, 35, self.ancho - 90, self.alto - 70)
+
+
+class IconosDiagrama:
+    """
+    Iconos de los tipos de nodo para el diagrama, compartidos por todos los
+    reportes del proceso. Cada PNG se lee y se reduce a `lado_px` píxeles la
+    primera vez que se usa (los originales son de 1024 px y se dibujan a unos
+    30 puntos); después, cada documento lo incrusta una sola vez como form
+    XObject y los nodos sólo lo referencian.
+
+    Los tipos que no están en `rutas` usan el icono de `por_defecto`. La
+    caché va por ruta, no por tipo: el tipo viene de los datos del usuario y
+    así no crece más que el número de iconos configurados.
+    """
+
+    def __init__(self, rutas, por_defecto=None, lado_px=128):
+        # tipo -> ruta del PNG
+        self.rutas = dict(rutas)
+        self.ruta_defecto = self.rutas.get(por_defecto)
+        self.lado_px = lado_px
+        # ruta -> nombre del form en el PDF
+        self._forms = {ruta: f"icono_{i}" for i, ruta in enumerate(dict.fromkeys(self.rutas.values()))}
+        # ruta -> ImageReader (None si el fichero no existe o no se puede leer)
+        self._imagenes = {}
+        self._lock = threading.Lock()
+
+    def _ruta(self, tipo):
+        return self.rutas.get(tipo, self.ruta_defecto)
+
+    def imagen(self, tipo):
+        """ImageReader reducido del icono de `tipo`, o None si no tiene."""
+        ruta = self._ruta(tipo)
+        if ruta is None:
+            return None
+        try:
+            return self._imagenes[ruta]
+        except KeyError:
+            pass
+        with self._lock:
+            if ruta not in self._imagenes:
+                self._imagenes[ruta] = self._cargar(ruta)
+            return self._imagenes[ruta]
+
+    def _cargar(self, ruta):
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with Image.open(ruta) as original:
+                imagen = original.convert("RGBA")
+        except OSError:
+            return None
+        imagen.thumbnail((self.lado_px, self.lado_px), Image.LANCZOS)
+        return ImageReader(imagen)
+
+    def dibujar(self, canv, tipo, x, y, lado):
+        """
+        Dibuja el icono de `tipo` en el cuadrado de `lado` puntos con esquina
+        inferior izquierda (x, y). Devuelve False si el tipo no tiene icono.
+        """
+        imagen = self.imagen(tipo)
+        if imagen is None:
+            return False
+        nombre = self._forms[self._ruta(tipo)]
+        if not canv.hasForm(nombre):
+            # Form de 1x1 puntos; cada nodo lo escala a su tamaño
+            canv.beginForm(nombre, 0, 0, 1, 1)
+            canv.drawImage(imagen, 0, 0, width=1, height=1, preserveAspectRatio=True, mask="auto")
+            canv.endForm()
+        canv.saveState()
+        canv.translate(x, y)
+        canv.scale(lado, lado)
+        canv.doForm(nombre)
+        canv.restoreState()
+        return True
+
+
+class HistoriaPerezosa:
+    """
+    La "lista" de flowables que consume doc.build, rellenada desde un
+    iterador a medida que se paginan los elementos anteriores. Implementa
+    sólo lo que BaseDocTemplate.build hace con la lista: len, índices y
+    cortes, del e insert (los trozos de un flowable partido vuelven al
+    principio).
+    """
+
+    def __init__(self, flowables, minimo=8):
+        self._pendientes = iter(flowables)
+        self._buffer = []
+        self._minimo = minimo
+
+    def _rellenar(self):
+        while self._pendientes is not None and len(self._buffer) < self._minimo:
+            try:
+                self._buffer.append(next(self._pendientes))
+            except StopIteration:
+                self._pendientes = None
+
+    def __len__(self):
+        self._rellenar()
+        return len(self._buffer)
+
+    def __getitem__(self, indice):
+        self._rellenar()
+        return self._buffer[indice]
+
+    def __setitem__(self, indice, valor):
+        self._buffer[indice] = valor
+
+    def __delitem__(self, indice):
+        self._rellenar()
+        del self._buffer[indice]
+
+    def insert(self, indice, valor):
+        self._buffer.insert(indice, valor)
+
+
+def construir_reporte(ruta, titulo, pie, flowables):
+    """Escribe en `ruta` el PDF con los `flowables` (un iterable, se consume perezosamente)."""
+
+    def numerar(canv, doc):
+        canv.saveState()
+        canv.setFont("Helvetica", 8)
+        canv.setFillColor(colors.grey)
+        canv.drawString(MARGEN, MARGEN / 2, pie)
+        canv.drawRightString(A4[0] - MARGEN, MARGEN / 2, f"Página {doc.page}")
+        canv.restoreState()
+
+    doc = SimpleDocTemplate(
+        ruta,
+        pagesize=A4,
+        leftMargin=MARGEN,
+        rightMargin=MARGEN,
+        topMargin=MARGEN,
+        bottomMargin=MARGEN,
+        title=titulo,
+        author="SecureNet Designer",
+        # Las páginas terminadas se guardan comprimidas hasta escribir el archivo
+        pageCompression=1,
+    )
+    doc.build(HistoriaPerezosa(flowables), onFirstPage=numerar, onLaterPages=numerar)
+
+
+def titulo_reporte(texto):
+    return Paragraph(escape(texto), ESTILO_TITULO)
+
+
+def titulo_seccion(texto):
+    return Paragraph(escape(texto), ESTILO_SECCION)
+
+
+def parrafo(texto):
+    return Paragraph(escape(texto), ESTILO_TEXTO)
+
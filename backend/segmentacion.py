@@ -0,0 +1,262 @@
+"""
+Análisis de segmentación (VLAN/Subred) de una topología.
+
+Un AnalizadorSegmentacion calcula los issues de una revisión concreta de la
+topología (una pasada por los nodos agrupando subred -> zonas y VLAN ->
+zonas) la primera vez que se piden y los guarda. RegistroSegmentacion
+comparte ese analizador entre peticiones mientras la revisión no cambie:
+las escrituras de políticas sólo le avanzan la revisión (no tocan nodos) y
+cualquier otro cambio lo descarta, y se recalcula entero en la próxima
+lectura.
+
+Además de agrupar por el texto exacto de la subred, detecta solapamientos
+CIDR entre zonas (p. ej. 10.0.0.0/24 dentro de 10.0.0.0/16) con un barrido
+ordenado en O(s log s) sobre las s subredes distintas.
+
+Lo usan tanto /vulnerabilidades_segmentacion como el reporte PDF.
+"""
+
+import ipaddress
+import threading
+from functools import lru_cache
+
+from cache_lru import CacheLRU
+
+
+# Nodos que se nombran en la descripción de cada red de un solapamiento
+MAX_NODOS_DESCRITOS = 5
+
+
+class AnalizadorSegmentacion:
+    def __init__(self, nodos, revision=0):
+        """`nodos`: tuplas (nombre, zona, subred, vlan) en orden de id_nodo."""
+        self.revision = revision
+        self.lock = threading.Lock()
+        # Subred sin espacios; None si no tiene ("" si sólo eran espacios)
+        self._nodos = [
+            (nombre, zona, subred.strip() if subred else None, vlan)
+            for nombre, zona, subred, vlan in nodos
+        ]
+        self._issues = None
+
+    @classmethod
+    def desde_nodos(cls, nodos, revision=0):
+        """Desde filas de la BD con nombre, zona_seguridad, subred y vlan."""
+        return cls(((n.nombre, n.zona_seguridad, n.subred, n.vlan) for n in nodos), revision)
+
+    def issues(self):
+        """Lista de issues (mismo formato que /vulnerabilidades_segmentacion)."""
+        with self.lock:
+            if self._issues is None:
+                self._issues = self._calcular()
+            return self._issues
+
+    def _calcular(self):
+        issues = []
+        # clave -> [nodos] en orden de aparición
+        subredes = {}
+        vlans = {}
+        for nodo in self._nodos:
+            nombre, zona, subred, vlan = nodo
+            # Nodos sin subred / sin VLAN definida
+            if subred is None:
+                issues.append({
+                    "tipo": "subred_no_definida",
+                    "nivel": "medio",
+                    "mensaje": f"Nodo '{nombre}' (zona {zona}) no tiene subred definida.",
+                })
+            elif subred:
+                subredes.setdefault(subred, []).append(nodo)
+            if vlan is None:
+                issues.append({
+                    "tipo": "vlan_no_definida",
+                    "nivel": "medio",
+                    "mensaje": f"Nodo '{nombre}' (zona {zona}) no tiene VLAN definida.",
+                })
+            else:
+                vlans.setdefault(vlan, []).append(nodo)
+
+        # Subred / VLAN compartida entre zonas distintas (en orden de aparición)
+        issues.extend(_issues_multizona(subredes, _issue_subred_multizona))
+        issues.extend(_calcular_solapes(subredes))
+        issues.extend(_issues_multizona(vlans, _issue_vlan_multizona))
+        return issues
+
+
+def _issues_multizona(grupos, plantilla):
+    """Issue de cada grupo (subred o VLAN) cuyos nodos están en más de una zona."""
+    for clave, nodos in grupos.items():
+        # Zonas en orden de aparición (determinista, a diferencia de un set)
+        zonas = dict.fromkeys(zona for _, zona, _, _ in nodos)
+        if len(zonas) > 1:
+            nombres = ", ".join(f"{nombre}({zona})" for nombre, zona, _, _ in nodos)
+            yield plantilla(clave, ", ".join(zonas), nombres)
+
+
+def _calcular_solapes(subredes):
+    """Issues de subredes CIDR de zonas distintas que se solapan."""
+    redes = []
+    for clave, nodos in subredes.items():
+        rango = _rango_cidr(clave)
+        if rango is None:
+            continue
+        version, inicio, fin = rango
+        redes.append((version, inicio, fin, clave, nodos))
+    return solapamientos_cidr(redes)
+
+
+@lru_cache(maxsize=65536)
+def _rango_cidr(subred):
+    """(versión IP, primera dirección, última dirección) como enteros, o None si no es CIDR válido."""
+    try:
+        red = ipaddress.ip_network(subred, strict=False)
+    except ValueError:
+        return None
+    return red.version, int(red.network_address), int(red.broadcast_address)
+
+
+def solapamientos_cidr(redes):
+    """
+    Detecta solapamientos entre subredes de zonas distintas.
+
+    `redes` es una lista de (versión, inicio, fin, clave, nodos) con nodos
+    = [(nombre, zona, ...)]. Dos bloques CIDR o son disjuntos o uno contiene
+    al otro, así que basta ordenar por (inicio, -fin) y barrer con una pila
+    de bloques "abiertos": los que quedan en la pila contienen al actual.
+    La pila tiene como mucho 33 (IPv4) o 129 (IPv6) niveles, por lo que el
+    coste total es O(n log n) por la ordenación.
+
+    Se emite un issue por cada par (contenedora, contenida) con zonas
+    distintas, y cada red se describe por su CIDR, sus zonas y como mucho
+    MAX_NODOS_DESCRITOS nodos: el tamaño de cada mensaje no depende de
+    cuántos nodos haya en las redes que la contienen.
+    """
+    # Claves distintas con el mismo rango (p. ej. 10.0.0.5/24 y 10.0.0.0/24)
+    # se tratan como una sola red
+    por_rango = {}
+    for version, inicio, fin, clave, nodos in redes:
+        claves, nodos_rango = por_rango.setdefault((version, inicio, fin), ([], []))
+        claves.append(clave)
+        nodos_rango.extend(nodos)
+
+    issues = []
+    pila = []  # [(version, fin, texto, zonas)] de las redes que contienen a la actual
+
+    for (version, inicio, fin), (claves, nodos) in sorted(
+        por_rango.items(), key=lambda item: (item[0][0], item[0][1], -item[0][2])
+    ):
+        zonas = {nodo[1] for nodo in nodos}
+        texto = _describir_red(claves, nodos)
+
+        # Misma red escrita de distintas formas y usada en varias zonas
+        if len(claves) > 1 and len(zonas) > 1:
+            issues.append(_issue_solape(
+                f"Las subredes {texto} son el mismo rango de direcciones "
+                "y se usan en zonas de seguridad distintas."
+            ))
+
+        while pila and (pila[-1][0] != version or pila[-1][1] < inicio):
+            pila.pop()
+
+        # Un issue por cada red que contiene a esta y tiene nodos de otra zona
+        for _, _, c_texto, c_zonas in reversed(pila):
+            if len(c_zonas | zonas) > 1:
+                issues.append(_issue_solape(
+                    f"La subred {texto} está contenida en {c_texto}, "
+                    "con nodos de otra zona de seguridad."
+                ))
+
+        pila.append((version, fin, texto, zonas))
+
+    return issues
+
+
+def _acotar(elementos, separador, total=None):
+    """Los primeros MAX_NODOS_DESCRITOS elementos, más "y K más" si hay `total` (o len) mayor."""
+    total = len(elementos) if total is None else total
+    texto = separador.join(elementos[:MAX_NODOS_DESCRITOS])
+    if total > MAX_NODOS_DESCRITOS:
+        texto += f" y {total - MAX_NODOS_DESCRITOS} más"
+    return texto
+
+
+def _describir_red(claves, nodos):
+    """CIDR(s) de una red con sus zonas y unos pocos de sus nodos."""
+    zonas = ", ".join(dict.fromkeys(nodo[1] for nodo in nodos))
+    nombres = [f"{nodo[0]}({nodo[1]})" for nodo in nodos[:MAX_NODOS_DESCRITOS]]
+    return f"{_acotar(claves, ' / ')} (zonas {zonas}; nodos: {_acotar(nombres, ', ', len(nodos))})"
+
+
+def _issue_solape(mensaje):
+    return {
+        "tipo": "subred_solapada_multizona",
+        "nivel": "alto",
+        "mensaje": f"{mensaje} Los rangos solapados reducen el aislamiento entre segmentos.",
+    }
+
+
+def _issue_subred_multizona(subred, zonas, nombres):
+    return {
+        "tipo": "subred_compartida_multizona",
+        "nivel": "alto",
+        "mensaje": (
+            f"La subred {subred} se usa en múltiples zonas de seguridad "
+            f"({zonas}): {nombres}. "
+            "Esto reduce el aislamiento entre segmentos."
+        ),
+    }
+
+
+def _issue_vlan_multizona(vlan, zonas, nombres):
+    return {
+        "tipo": "vlan_compartida_multizona",
+        "nivel": "alto",
+        "mensaje": (
+            f"La VLAN {vlan} se utiliza en múltiples zonas de seguridad "
+            f"({zonas}): {nombres}. "
+            "Una misma VLAN en zonas distintas puede implicar puentes no deseados."
+        ),
+    }
+
+
+class RegistroSegmentacion:
+    """
+    Analizadores por topología, cada uno válido para una revisión concreta
+    de la topología. Si la revisión no coincide se reconstruye desde la BD.
+    """
+
+    def __init__(self, max_topologias=128):
+        self._cache = CacheLRU(max_topologias)
+
+    def obtener(self, id_topologia, revision, cargar_nodos):
+        """
+        Analizador al día con `revision`. `cargar_nodos()` sólo se llama si
+        hay que reconstruirlo.
+        """
+        analizador = self._cache.get(id_topologia)
+        if analizador is None or analizador.revision != revision:
+            analizador = AnalizadorSegmentacion.desde_nodos(cargar_nodos(), revision)
+            self._cache.set(id_topologia, analizador)
+        return analizador
+
+    def avanzar(self, id_topologia, revision_nueva):
+        """
+        Lleva a `revision_nueva` el analizador de una escritura que no tocó
+        los nodos (p. ej. de políticas), para no recalcularlo. Sólo si estaba
+        en la revisión inmediatamente anterior; si no, se descarta y se
+        reconstruirá en la próxima lectura.
+        """
+        analizador = self._cache.get(id_topologia)
+        if analizador is None:
+            return
+        with analizador.lock:
+            if analizador.revision != revision_nueva - 1:
+                self.descartar(id_topologia)
+                return
+            analizador.revision = revision_nueva
+
+    def registrar(self, id_topologia, analizador):
+        self._cache.set(id_topologia, analizador)
+
+    def descartar(self, id_topologia):
+        self._cache.descartar(lambda clave: clave == id_topologia)
@@ -0,0 +1,36 @@
+"""
+Fixtures comunes: una app sobre una BD SQLite temporal por prueba, su
+cliente de pruebas de Flask y un servidor GNS3 falso en memoria.
+"""
+
+import pytest
+
+from app import create_app, db
+from benchmarks.fake_gns3 import iniciar_servidor
+
+
+@pytest.fixture
+def servidor_gns3():
+    servidor, url = iniciar_servidor()
+    servidor.url = url
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def app(tmp_path, servidor_gns3):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "pruebas.db"),
+        "REPORTES_CACHE_DIR": str(tmp_path / "reportes"),
+        "GNS3_SERVER_URL": servidor_gns3.url,
+    })
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
@@ -0,0 +1,116 @@
+"""Análisis de políticas sombreadas, redundantes y en conflicto frente a la comparación por pares."""
+
+import json
+import random
+
+import pytest
+
+from utilidades import crear_topologia, peticion
+
+
+TOPOLOGIA = {
+    "nombre": "analisis",
+    "nodos": [
+        {"id_cliente": "fw1", "nombre": "fw1", "tipo": "firewall", "zona_seguridad": "interna"},
+        {"id_cliente": "fw2", "nombre": "fw2", "tipo": "firewall", "zona_seguridad": "dmz"},
+        {"id_cliente": "h1", "nombre": "h1", "tipo": "host", "zona_seguridad": "interna"},
+        {"id_cliente": "s1", "nombre": "s1", "tipo": "servidor", "zona_seguridad": "dmz"},
+    ],
+    "enlaces": [],
+}
+
+
+def _politicas_aleatorias(n, seed):
+    # Pocos valores posibles para que haya muchas reglas del mismo grupo
+    rnd = random.Random(seed)
+    return [
+        {
+            "firewall": rnd.choice(("fw1", "fw2")),
+            "tipo_origen": "zona",
+            "origen": rnd.choice(("interna", "externa")),
+            "tipo_destino": "nodo",
+            "destino": "s1",
+            "servicio": rnd.choice(("http", "dns")),
+            "protocolo": rnd.choice((None, "tcp", "udp")),
+            "puerto": rnd.choice((None, 53, 80)),
+            "accion": rnd.choice(("permitir", "denegar")),
+        }
+        for _ in range(n)
+    ]
+
+
+def _compatibles(a, b):
+    return a is None or b is None or a == b
+
+
+def _hallazgos_por_pares(politicas, por_firewall):
+    """Para cada regla, la primera anterior del grupo que la cubre o, si no hay, que choca con ella."""
+    esperados = {}
+    for i, regla in enumerate(politicas):
+        previas = [
+            p for p in politicas[:i]
+            if (p["servicio"], p["origen"], p["destino"]) == (regla["servicio"], regla["origen"], regla["destino"])
+            and (not por_firewall or p["id_firewall"] == regla["id_firewall"])
+        ]
+        cubre = next((
+            p for p in previas
+            if p["protocolo"] in (None, regla["protocolo"]) and p["puerto"] in (None, regla["puerto"])
+        ), None)
+        if cubre is not None:
+            tipo = "regla_redundante" if cubre["accion"] == regla["accion"] else "regla_sombreada"
+            esperados[regla["id_politica"]] = (tipo, cubre["id_politica"])
+            continue
+        choca = next((
+            p for p in previas
+            if p["accion"] != regla["accion"]
+            and _compatibles(p["protocolo"], regla["protocolo"])
+            and _compatibles(p["puerto"], regla["puerto"])
+        ), None)
+        if choca is not None:
+            esperados[regla["id_politica"]] = ("reglas_en_conflicto", choca["id_politica"])
+    return esperados
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("alcance", ["firewall", "topologia"])
+def test_analisis_equivale_a_comparar_por_pares(cliente, seed, alcance):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    base = f"/topologias/{id_topologia}"
+    peticion(cliente, "POST", f"{base}/politicas/importar", 201,
+             data="".join(json.dumps(p) + "\n" for p in _politicas_aleatorias(120, seed)),
+             headers={"Content-Type": "application/x-ndjson"})
+    politicas = peticion(cliente, "GET", f"{base}/politicas", 200).get_json()
+
+    hallazgos = peticion(cliente, "GET", f"{base}/analisis_politicas?alcance={alcance}", 200).get_json()
+    obtenidos = {h["id_politica"]: (h["tipo"], h["id_politica_previa"]) for h in hallazgos}
+    assert len(obtenidos) == len(hallazgos)
+
+    esperados = _hallazgos_por_pares(politicas, alcance == "firewall")
+    assert obtenidos == esperados
+    assert {tipo for tipo, _ in esperados.values()} == {"regla_redundante", "regla_sombreada", "reglas_en_conflicto"}
+
+
+def test_regla_sombreada_nunca_gana_en_simular(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    base = f"/topologias/{id_topologia}"
+    politicas = _politicas_aleatorias(120, 7)
+    peticion(cliente, "POST", f"{base}/politicas/importar", 201,
+             data="".join(json.dumps(p) + "\n" for p in politicas),
+             headers={"Content-Type": "application/x-ndjson"})
+    tapadas = {
+        h["id_politica"]
+        for h in peticion(cliente, "GET", f"{base}/analisis_politicas?alcance=topologia", 200).get_json()
+        if h["tipo"] in ("regla_sombreada", "regla_redundante")
+    }
+    assert tapadas
+
+    # Un escenario por combinación: ninguna regla tapada decide nunca
+    for origen in ("interna", "externa"):
+        for servicio in ("http", "dns"):
+            for protocolo, puerto in (("tcp", 80), ("udp", 53), ("tcp", 53), (None, None)):
+                peticion(cliente, "POST", f"{base}/escenarios", 201, json={
+                    "tipo_origen": "zona", "origen": origen, "tipo_destino": "nodo", "destino": "s1",
+                    "servicio": servicio, "protocolo": protocolo, "puerto": puerto,
+                })
+    for r in peticion(cliente, "POST", f"{base}/simular?persistir=0", 200).get_json():
+        assert not any(f"#{id_politica} " in r["detalle"] for id_politica in tapadas), r
@@ -0,0 +1,163 @@
+"""Exportación a GNS3 contra el servidor falso de benchmarks.fake_gns3."""
+
+from collections import Counter
+
+import pytest
+
+from app import Enlace, Nodo, db
+from benchmarks.generador import generar_topologia
+from utilidades import crear_topologia, peticion
+
+
+@pytest.fixture
+def topologia(cliente):
+    return crear_topologia(cliente, generar_topologia(40, seed=5))
+
+
+def _exportar(cliente, id_topologia, esperado, modo="nuevo"):
+    return peticion(
+        cliente, "POST", f"/topologias/{id_topologia}/exportar_gns3?modo={modo}", esperado
+    ).get_json()
+
+
+def _en_gns3(servidor, project_id):
+    """(nombres de nodos, pares de nombres enlazados) del proyecto en el servidor falso."""
+    proyecto = servidor.estado.proyectos[project_id]
+    nombres = {node_id: n["name"] for node_id, n in proyecto["nodes"].items()}
+    enlaces = Counter(
+        frozenset(nombres[extremo["node_id"]] for extremo in link["nodes"])
+        for link in proyecto["links"].values()
+    )
+    return Counter(nombres.values()), enlaces
+
+
+def _en_bd(cliente, id_topologia):
+    """Lo mismo, según la topología guardada."""
+    datos = peticion(cliente, "GET", f"/topologias/{id_topologia}", 200).get_json()
+    nombres = {n["id_nodo"]: n["nombre"] for n in datos["nodos"]}
+    enlaces = Counter(
+        frozenset((nombres[e["id_nodo_origen"]], nombres[e["id_nodo_destino"]])) for e in datos["enlaces"]
+    )
+    return Counter(nombres.values()), enlaces
+
+
+def test_exportacion_nueva_replica_la_topologia(cliente, servidor_gns3, topologia):
+    cuerpo = _exportar(cliente, topologia, 201)
+    nodos, enlaces = _en_bd(cliente, topologia)
+    assert cuerpo["cambios"]["nodos_creados"] == sum(nodos.values())
+    assert cuerpo["cambios"]["enlaces_creados"] == sum(enlaces.values())
+    assert _en_gns3(servidor_gns3, cuerpo["gns3_project_id"]) == (nodos, enlaces)
+
+
+def test_fallo_de_un_nodo_borra_el_proyecto_a_medias(cliente, servidor_gns3, topologia):
+    servidor_gns3.estado.fallar("POST", r"/nodes$")
+    cuerpo = _exportar(cliente, topologia, 502)
+    assert "Fallo inyectado" in cuerpo["error"]
+    assert servidor_gns3.estado.proyectos == {}
+
+
+def test_respuesta_2xx_que_no_es_json_da_502(cliente, servidor_gns3, topologia):
+    servidor_gns3.estado.fallar("POST", r"/nodes$", status=201, cuerpo=b"<html>ok</html>")
+    cuerpo = _exportar(cliente, topologia, 502)
+    assert "no JSON" in cuerpo["error"]
+    assert servidor_gns3.estado.proyectos == {}
+
+
+def _nodo(id_topologia, nombre):
+    return Nodo.query.filter_by(id_topologia=id_topologia, nombre=nombre).one()
+
+
+def _borrar_nodo(id_topologia, nombre):
+    nodo = _nodo(id_topologia, nombre)
+    Enlace.query.filter(
+        (Enlace.id_nodo_origen == nodo.id_nodo) | (Enlace.id_nodo_destino == nodo.id_nodo)
+    ).delete(synchronize_session=False)
+    db.session.delete(nodo)
+
+
+def _sin_cambios(cambios):
+    return not any(cambios.values())
+
+
+def test_sincronizar_tras_renombrar_borrar_y_anadir(app, cliente, servidor_gns3, topologia):
+    project_id = _exportar(cliente, topologia, 201)["gns3_project_id"]
+    assert _sin_cambios(_exportar(cliente, topologia, 200, "sincronizar")["cambios"])
+
+    # La API no edita nodos sueltos: cambiamos la BD directamente
+    with app.app_context():
+        renombrado = _nodo(topologia, "host_10")
+        renombrado.nombre = "renombrado"
+        renombrado.posicion_x += 100
+        recreado = _nodo(topologia, "host_11")
+        recreado.tipo = "router"  # cambio de plantilla: se recrea con sus enlaces
+        _borrar_nodo(topologia, "host_12")
+        enlaces_recreado = Enlace.query.filter(
+            (Enlace.id_nodo_origen == recreado.id_nodo) | (Enlace.id_nodo_destino == recreado.id_nodo)
+        ).count()
+        nuevo = Nodo(id_topologia=topologia, nombre="nuevo", tipo="host", zona_seguridad="interna",
+                     posicion_x=0, posicion_y=0)
+        db.session.add(nuevo)
+        db.session.flush()
+        db.session.add(Enlace(id_topologia=topologia, id_nodo_origen=nuevo.id_nodo,
+                              id_nodo_destino=_nodo(topologia, "host_13").id_nodo))
+        db.session.commit()
+
+    cuerpo = _exportar(cliente, topologia, 200, "sincronizar")
+    assert cuerpo["gns3_project_id"] == project_id
+    assert cuerpo["cambios"] == {
+        "nodos_creados": 2,
+        "nodos_actualizados": 1,
+        "nodos_eliminados": 2,
+        # Los de host_11 se fueron con su nodo al recrearlo
+        "enlaces_creados": 1 + enlaces_recreado,
+        "enlaces_eliminados": 0,
+    }
+    assert _en_gns3(servidor_gns3, project_id) == _en_bd(cliente, topologia)
+    assert _sin_cambios(_exportar(cliente, topologia, 200, "sincronizar")["cambios"])
+
+
+@pytest.mark.parametrize("metodo, patron", [
+    ("PUT", r"/nodes/"),
+    ("DELETE", r"/nodes/"),
+    ("DELETE", r"/links/"),
+    ("POST", r"/links$"),
+])
+def test_sincronizar_con_fallos_se_completa_al_reintentar(app, cliente, servidor_gns3, topologia, metodo, patron):
+    project_id = _exportar(cliente, topologia, 201)["gns3_project_id"]
+    en_gns3_antes = _en_gns3(servidor_gns3, project_id)
+
+    with app.app_context():
+        _nodo(topologia, "host_10").nombre = "renombrado"
+        _borrar_nodo(topologia, "host_12")
+        a, b = _nodo(topologia, "host_20"), _nodo(topologia, "host_21")
+        Enlace.query.filter_by(id_nodo_origen=a.id_nodo).delete(synchronize_session=False)
+        db.session.add(Enlace(id_topologia=topologia, id_nodo_origen=a.id_nodo, id_nodo_destino=b.id_nodo))
+        db.session.commit()
+
+    servidor_gns3.estado.fallar(metodo, patron)
+    cuerpo = _exportar(cliente, topologia, 207, "sincronizar")
+    assert cuerpo["errores"]
+    # Sólo cuenta lo que GNS3 aceptó
+    campo = {
+        ("PUT", r"/nodes/"): "nodos_actualizados",
+        ("DELETE", r"/nodes/"): "nodos_eliminados",
+        ("DELETE", r"/links/"): "enlaces_eliminados",
+        ("POST", r"/links$"): "enlaces_creados",
+    }[metodo, patron]
+    assert cuerpo["cambios"][campo] == 0
+    assert _en_gns3(servidor_gns3, project_id) != en_gns3_antes
+
+    servidor_gns3.estado.fallos.clear()
+    cuerpo = _exportar(cliente, topologia, 200, "sincronizar")
+    assert cuerpo["cambios"][campo] > 0
+    assert _en_gns3(servidor_gns3, project_id) == _en_bd(cliente, topologia)
+    assert _sin_cambios(_exportar(cliente, topologia, 200, "sincronizar")["cambios"])
+
+
+def test_sincronizar_sin_proyecto_en_gns3_exporta_de_cero(cliente, servidor_gns3, topologia):
+    project_id = _exportar(cliente, topologia, 201)["gns3_project_id"]
+    del servidor_gns3.estado.proyectos[project_id]
+
+    cuerpo = _exportar(cliente, topologia, 201, "sincronizar")
+    assert cuerpo["modo"] == "nuevo"
+    assert _en_gns3(servidor_gns3, cuerpo["gns3_project_id"]) == _en_bd(cliente, topologia)
@@ -0,0 +1,139 @@
+"""Importación/exportación masiva de políticas: ida y vuelta y filas con errores."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from benchmarks.generador import generar
+from importacion_politicas import CAMPOS
+from utilidades import crear_topologia, peticion
+
+
+TOPOLOGIA = {
+    "nombre": "importacion",
+    "nodos": [{"id_cliente": "fw", "nombre": "fw", "tipo": "firewall", "zona_seguridad": "interna"}],
+    "enlaces": [],
+}
+CABECERA = "firewall,origen,destino,servicio,protocolo,puerto,accion\n"
+BUENA = "fw,interna,dmz,http,tcp,80,permitir\n"
+
+
+def _importar(cliente, id_topologia, cuerpo, formato="csv", esperado=201, query=""):
+    tipo = "text/csv" if formato == "csv" else "application/x-ndjson"
+    return peticion(
+        cliente, "POST", f"/topologias/{id_topologia}/politicas/importar{query}", esperado,
+        data=cuerpo, headers={"Content-Type": tipo},
+    ).get_json()
+
+
+def _exportar(cliente, id_topologia, formato):
+    return peticion(
+        cliente, "GET", f"/topologias/{id_topologia}/politicas/exportar?formato={formato}", 200
+    ).get_data()
+
+
+def _a_csv(politicas):
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=CAMPOS, lineterminator="\n")
+    escritor.writeheader()
+    for pol in politicas:
+        escritor.writerow({k: "" if v is None else v for k, v in pol.items()})
+    return buffer.getvalue().encode()
+
+
+def _a_ndjson(politicas):
+    return "".join(json.dumps(pol) + "\n" for pol in politicas).encode()
+
+
+@pytest.mark.parametrize("formato", ["csv", "ndjson"])
+def test_ida_y_vuelta(cliente, formato):
+    datos = generar(150, politicas_por_firewall=40, n_escenarios=0, seed=3)
+    origen = crear_topologia(cliente, datos.topologia)
+    copia = crear_topologia(cliente, datos.topologia)
+
+    cuerpo = _a_csv(datos.politicas) if formato == "csv" else _a_ndjson(datos.politicas)
+    resumen = _importar(cliente, origen, cuerpo, formato)
+    assert resumen["filas"] == resumen["insertadas"] == len(datos.politicas)
+    assert resumen["con_errores"] == 0
+
+    exportado = _exportar(cliente, origen, formato)
+    if formato == "ndjson":
+        filas = [json.loads(linea) for linea in exportado.decode().splitlines()]
+        assert filas == [{**pol, "descripcion": None} for pol in datos.politicas]
+
+    # Lo exportado se importa tal cual en otra topología con los mismos firewalls
+    _importar(cliente, copia, exportado, formato)
+    assert _exportar(cliente, copia, formato) == exportado
+
+
+def test_filas_con_errores_por_numero(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    cuerpo = (
+        CABECERA
+        + BUENA
+        + "otro,interna,dmz,http,tcp,80,permitir\n"
+        + "fw,interna,dmz,http,tcp,99999,permitir\n"
+        + "fw,interna,dmz,http,tcp,80,quizas\n"
+        + BUENA
+    )
+    resumen = _importar(cliente, id_topologia, cuerpo.encode())
+    assert (resumen["filas"], resumen["insertadas"], resumen["con_errores"]) == (5, 2, 3)
+    assert [e["fila"] for e in resumen["errores"]] == [3, 4, 5]
+    assert "firewall" in resumen["errores"][0]["errores"][0]
+    assert resumen["errores"][1]["errores"] == ["puerto: debe ser un entero entre 0 y 65535"]
+    assert resumen["errores"][2]["errores"][0].startswith("accion:")
+
+
+def test_atomico_no_inserta_nada_si_hay_errores(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    cuerpo = CABECERA + BUENA + "fw,interna,dmz,http,tcp,x,permitir\n"
+    resumen = _importar(cliente, id_topologia, cuerpo.encode(), esperado=400, query="?atomico=1")
+    assert (resumen["insertadas"], resumen["con_errores"]) == (0, 1)
+    assert peticion(cliente, "GET", f"/topologias/{id_topologia}/politicas", 200).get_json() == []
+
+
+def test_sin_filas_validas_responde_400(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    resumen = _importar(cliente, id_topologia, (CABECERA + "fw,,dmz,http,tcp,80,permitir\n").encode(), esperado=400)
+    assert resumen["errores"] == [{"fila": 2, "errores": ["origen: es obligatorio"]}]
+
+
+def test_bytes_no_utf8_son_errores_de_fila(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+
+    resumen = _importar(cliente, id_topologia, (CABECERA + BUENA).encode() + b"fw,\xff\xfe,dmz,http,tcp,80,permitir\n")
+    assert (resumen["insertadas"], resumen["con_errores"]) == (1, 1)
+    assert resumen["errores"][0]["fila"] == 3
+
+    resumen = _importar(cliente, id_topologia, b"\xff\xfe" + CABECERA.encode() + BUENA.encode(), esperado=400)
+    assert resumen["errores"][0]["fila"] == 1
+
+    ndjson = _a_ndjson([{"firewall": "fw", "origen": "a", "destino": "b", "servicio": "s", "accion": "permitir"}])
+    resumen = _importar(cliente, id_topologia, ndjson + b"\xff\n" + b"[1]\n", formato="ndjson")
+    assert (resumen["insertadas"], [e["fila"] for e in resumen["errores"]]) == (1, [2, 3])
+
+
+def test_csv_mal_formado_conserva_lo_leido(cliente):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    # Un campo mayor que el límite del módulo csv corta la lectura
+    cuerpo = CABECERA + BUENA + "fw,interna," + "x" * 200000 + ",http,tcp,80,permitir\n"
+    resumen = _importar(cliente, id_topologia, cuerpo.encode())
+    assert (resumen["filas"], resumen["insertadas"], resumen["con_errores"]) == (2, 1, 1)
+    assert resumen["errores"][0]["fila"] == 3
+    assert resumen["errores"][0]["errores"][0].startswith("CSV mal formado")
+
+
+@pytest.mark.parametrize("puerto, mensaje", [
+    ("1.5", "debe ser un entero"),
+    ("true", "debe ser un entero"),
+    ("1e400", "debe ser un entero"),
+    ("1" + "0" * 400, "debe ser un entero entre 0 y 65535"),
+])
+def test_puertos_invalidos_en_ndjson(cliente, puerto, mensaje):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    linea = ('{"firewall": "fw", "origen": "a", "destino": "b", "servicio": "s", '
+             '"accion": "permitir", "puerto": %s}\n' % puerto)
+    resumen = _importar(cliente, id_topologia, linea.encode(), formato="ndjson", esperado=400)
+    assert resumen["errores"] == [{"fila": 1, "errores": [f"puerto: {mensaje}"]}]
@@ -0,0 +1,84 @@
+"""Paginación keyset (limit/cursor) y proyección de campos en los listados."""
+
+import json
+
+from utilidades import crear_topologia, peticion
+
+
+TOPOLOGIA = {
+    "nombre": "paginacion",
+    "nodos": [{"id_cliente": "fw", "nombre": "fw", "tipo": "firewall", "zona_seguridad": "interna"}],
+    "enlaces": [],
+}
+
+
+def _recorrer(cliente, url, limite):
+    """Todas las páginas siguiendo X-Next-Cursor: (filas, páginas, X-Total-Count de cada una)."""
+    filas, paginas, totales = [], 0, set()
+    separador = "&" if "?" in url else "?"
+    cursor = None
+    while True:
+        pagina = f"{url}{separador}limit={limite}" + (f"&cursor={cursor}" if cursor else "")
+        resp = peticion(cliente, "GET", pagina, 200)
+        filas += resp.get_json()
+        paginas += 1
+        totales.add(resp.headers["X-Total-Count"])
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return filas, paginas, totales
+
+
+def _con_politicas(cliente, n):
+    id_topologia = crear_topologia(cliente, TOPOLOGIA)
+    cuerpo = "".join(
+        json.dumps({"firewall": "fw", "origen": f"o{i}", "destino": "dmz", "servicio": "http", "accion": "permitir"}) + "\n"
+        for i in range(n)
+    )
+    peticion(cliente, "POST", f"/topologias/{id_topologia}/politicas/importar", 201,
+             data=cuerpo, headers={"Content-Type": "application/x-ndjson"})
+    return f"/topologias/{id_topologia}/politicas"
+
+
+def test_cursor_recorre_todas_las_politicas_sin_repetir(cliente):
+    url = _con_politicas(cliente, 23)
+    todas = peticion(cliente, "GET", url, 200).get_json()
+    assert len(todas) == 23
+
+    filas, paginas, totales = _recorrer(cliente, url, 5)
+    assert filas == todas
+    assert paginas == 5
+    assert totales == {"23"}
+
+
+def test_ultima_pagina_exacta_no_tiene_cursor(cliente):
+    url = _con_politicas(cliente, 10)
+    resp = peticion(cliente, "GET", f"{url}?limit=10", 200)
+    assert len(resp.get_json()) == 10
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_topologias_en_orden_descendente(cliente):
+    ids = [crear_topologia(cliente, {**TOPOLOGIA, "nombre": f"t{i}"}) for i in range(7)]
+    filas, paginas, totales = _recorrer(cliente, "/topologias", 3)
+    assert [t["id_topologia"] for t in filas] == sorted(ids, reverse=True)
+    assert (paginas, totales) == (3, {"7"})
+
+
+def test_campos_proyecta_y_siempre_incluye_la_pk(cliente):
+    url = _con_politicas(cliente, 3)
+    filas = peticion(cliente, "GET", f"{url}?campos=origen,accion&limit=2", 200).get_json()
+    assert filas == [
+        {"id_politica": filas[0]["id_politica"], "origen": "o0", "accion": "permitir"},
+        {"id_politica": filas[1]["id_politica"], "origen": "o1", "accion": "permitir"},
+    ]
+    error = peticion(cliente, "GET", f"{url}?campos=origen,nope", 400).get_json()["error"]
+    assert "nope" in error
+
+
+def test_pagina_en_ndjson(cliente):
+    url = _con_politicas(cliente, 6)
+    todas = peticion(cliente, "GET", url, 200).get_json()
+    resp = peticion(cliente, "GET", f"{url}?limit=4&cursor={todas[0]['id_politica']}", 200,
+                    headers={"Accept": "application/x-ndjson"})
+    assert [json.loads(linea) for linea in resp.get_data(as_text=True).splitlines()] == todas[1:5]
+    assert resp.headers["X-Total-Count"] == "6"
@@ -0,0 +1,109 @@
+"""/simular con el índice compilado frente al recorrido completo de todas las políticas."""
+
+import json
+import random
+
+import pytest
+
+import app as modulo_app
+from benchmarks.generador import generar
+from utilidades import crear_topologia, peticion
+
+
+def _evaluar_ingenuo(esc, politicas, nodos):
+    """El algoritmo original: todas las políticas para cada escenario."""
+    zona_por_nodo = {}
+    for n in nodos:
+        zona_por_nodo.setdefault(n["nombre"], n["zona_seguridad"])
+    firewalls = {n["id_nodo"]: n["nombre"] for n in nodos if (n["tipo"] or "").lower() == "firewall"}
+
+    origen_claves = [(esc["tipo_origen"], esc["origen"])]
+    destino_claves = [(esc["tipo_destino"], esc["destino"])]
+    if esc["tipo_origen"] == "nodo" and zona_por_nodo.get(esc["origen"]):
+        origen_claves.append(("zona", zona_por_nodo[esc["origen"]]))
+    if esc["tipo_destino"] == "nodo" and zona_por_nodo.get(esc["destino"]):
+        destino_claves.append(("zona", zona_por_nodo[esc["destino"]]))
+
+    mejor, mejor_score = None, -1
+    for pol in politicas:
+        if pol["servicio"] != esc["servicio"]:
+            continue
+        if pol["protocolo"] and esc["protocolo"] and pol["protocolo"] != esc["protocolo"]:
+            continue
+        if pol["puerto"] and esc["puerto"] and pol["puerto"] != esc["puerto"]:
+            continue
+        if (pol["tipo_origen"], pol["origen"]) not in origen_claves:
+            continue
+        if (pol["tipo_destino"], pol["destino"]) not in destino_claves:
+            continue
+        score = (pol["tipo_origen"] == "nodo") + (pol["tipo_destino"] == "nodo")
+        if score > mejor_score:
+            mejor, mejor_score = pol, score
+
+    if mejor is None:
+        return "permitido", "No se encontró política aplicable: permitido por defecto"
+    fw = firewalls.get(mejor["id_firewall"])
+    fw_label = f" en el firewall {fw}" if fw is not None else " en el firewall lógico de la topología"
+    texto = (
+        f"#{mejor['id_politica']}{fw_label} "
+        f"({mejor['tipo_origen']} {mejor['origen']} -> {mejor['tipo_destino']} {mejor['destino']})"
+    )
+    if mejor["accion"] == "denegar":
+        return "bloqueado", f"Bloqueado por política {texto}"
+    return "permitido", f"Permitido por política {texto}"
+
+
+def _cargar_topologia_aleatoria(cliente, seed):
+    datos = generar(120, politicas_por_firewall=150, n_escenarios=300, seed=seed)
+    id_topologia = crear_topologia(cliente, datos.topologia)
+    base = f"/topologias/{id_topologia}"
+
+    peticion(cliente, "POST", f"{base}/politicas/importar", 201,
+             data="".join(json.dumps(pol) + "\n" for pol in datos.politicas),
+             headers={"Content-Type": "application/x-ndjson"})
+
+    rnd = random.Random(seed)
+    for esc in datos.escenarios:
+        if rnd.random() < 0.2:
+            # Escenarios sin protocolo/puerto: casan con cualquier regla del servicio
+            esc = {**esc, "protocolo": None, "puerto": None}
+        peticion(cliente, "POST", f"{base}/escenarios", 201, json=esc)
+    return base
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("vectorizar_desde", [0, 1])
+def test_simular_equivale_al_recorrido_completo(cliente, monkeypatch, seed, vectorizar_desde):
+    # 0 = nunca vectorizar; 1 = siempre (si NumPy está instalado)
+    monkeypatch.setattr(modulo_app, "SIMULACION_VECTORIZADA_MIN", vectorizar_desde)
+    base = _cargar_topologia_aleatoria(cliente, seed)
+
+    politicas = peticion(cliente, "GET", f"{base}/politicas", 200).get_json()
+    nodos = peticion(cliente, "GET", base, 200).get_json()["nodos"]
+    escenarios = peticion(cliente, "GET", f"{base}/escenarios", 200).get_json()
+
+    resultados = peticion(cliente, "POST", f"{base}/simular?persistir=0", 200).get_json()
+    assert [r["id_escenario"] for r in resultados] == [e["id_escenario"] for e in escenarios]
+
+    bloqueados = 0
+    for esc, r in zip(escenarios, resultados):
+        esperado = _evaluar_ingenuo(esc, politicas, nodos)
+        assert (r["resultado"], r["detalle"]) == esperado, esc
+        bloqueados += esperado[0] == "bloqueado"
+    # Los datos deben ejercitar reglas que bloquean y reglas que permiten
+    assert 0 < bloqueados < len(escenarios)
+
+
+def test_simular_persiste_solo_los_cambios(cliente):
+    base = _cargar_topologia_aleatoria(cliente, 4)
+
+    resp = peticion(cliente, "POST", f"{base}/simular", 200)
+    assert int(resp.headers["X-Escenarios-Cambiados"]) > 0
+    guardados = peticion(cliente, "GET", f"{base}/escenarios", 200).get_json()
+    assert [(e["resultado"], e["detalle"]) for e in guardados] == [
+        (r["resultado"], r["detalle"]) for r in resp.get_json()
+    ]
+
+    # Sin cambios en políticas ni escenarios, una segunda pasada no escribe nada
+    resp = peticion(cliente, "POST", f"{base}/simular", 200)
+    assert resp.headers["X-Escenarios-Cambiados"] == "0"
@@ -0,0 +1,11 @@
+"""Ayudas compartidas por las pruebas."""
+
+
+def peticion(cliente, metodo, url, esperado, **kwargs):
+    resp = cliente.open(url, method=metodo, **kwargs)
+    assert resp.status_code == esperado, f"{metodo} {url}: {resp.status_code} {resp.get_data(as_text=True)[:500]}"
+    return resp
+
+
+def crear_topologia(cliente, topologia):
+    return peticion(cliente, "POST", "/topologias", 201, json=topologia).get_json()["id_topologia"]
@@ -0,0 +1,107 @@
+"""
+Trabajos en segundo plano dentro del proceso (reportes PDF, exportaciones a GNS3).
+
+Las operaciones pesadas se encolan en un pool de hilos acotado y el endpoint
+responde 202 con un id de trabajo que se consulta después. Los resultados se
+conservan durante un TTL y luego se descartan.
+
+Nota: el estado vive en memoria del proceso; con varios workers, el id sólo
+es válido en el worker que creó el trabajo.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ColaLlena(Exception):
+    """Se alcanzó el máximo de trabajos pendientes/en curso."""
+
+
+class Trabajo:
+    def __init__(self, tipo, descripcion=None):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.descripcion = descripcion
+        self.estado = "pendiente"      # pendiente / en_curso / completado / error
+        self.creado = time.time()
+        self.iniciado = None
+        self.terminado = None
+        self.resultado = None
+        self.error = None
+
+    @property
+    def finalizado(self):
+        return self.estado in ("completado", "error")
+
+    def a_dict(self):
+        return {
+            "id_trabajo": self.id,
+            "tipo": self.tipo,
+            "descripcion": self.descripcion,
+            "estado": self.estado,
+            "creado": self.creado,
+            "iniciado": self.iniciado,
+            "terminado": self.terminado,
+            "error": self.error,
+        }
+
+
+class GestorTrabajos:
+    def __init__(self, max_concurrentes=2, max_en_cola=16, ttl_segundos=600):
+        self.max_en_cola = max(1, int(max_en_cola))
+        self.ttl_segundos = ttl_segundos
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(max_concurrentes)), thread_name_prefix="trabajo"
+        )
+        self._trabajos = {}
+        self._lock = threading.Lock()
+
+    def enviar(self, tipo, funcion, *args, descripcion=None, **kwargs):
+        """
+        Encola `funcion(*args, **kwargs)` y devuelve el Trabajo.
+        Lanza ColaLlena si ya hay demasiados trabajos sin terminar.
+        """
+        with self._lock:
+            self._purgar()
+            activos = sum(1 for t in self._trabajos.values() if not t.finalizado)
+            if activos >= self.max_en_cola:
+                raise ColaLlena(f"Hay {activos} trabajos en curso; inténtalo más tarde")
+
+            trabajo = Trabajo(tipo, descripcion)
+            self._trabajos[trabajo.id] = trabajo
+
+        self._pool.submit(self._ejecutar, trabajo, funcion, args, kwargs)
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        with self._lock:
+            self._purgar()
+            return self._trabajos.get(id_trabajo)
+
+    def _ejecutar(self, trabajo, funcion, args, kwargs):
+        trabajo.estado = "en_curso"
+        trabajo.iniciado = time.time()
+        try:
+            trabajo.resultado = funcion(*args, **kwargs)
+            trabajo.estado = "completado"
+        except Exception as e:
+            trabajo.error = str(e) or e.__class__.__name__
+            trabajo.estado = "error"
+        finally:
+            trabajo.terminado = time.time()
+
+    def _purgar(self):
+        """Descarta los trabajos terminados hace más de `ttl_segundos` (con el lock tomado)."""
+        limite = time.time() - self.ttl_segundos
+        vencidos = [
+            id_trabajo
+            for id_trabajo, t in self._trabajos.items()
+            if t.finalizado and t.terminado < limite
+        ]
+        for id_trabajo in vencidos:
+            del self._trabajos[id_trabajo]
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
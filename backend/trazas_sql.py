@@ -0,0 +1,66 @@
+"""
+Traza de las sentencias SQL de una petición y detección de N+1.
+
+Cada sentencia se reduce a su "forma" (literales y parámetros sustituidos por
+?, listas IN colapsadas) para que las consultas que sólo cambian de
+parámetros cuenten juntas. Una misma forma repetida muchas veces en una
+petición suele ser una carga perezosa dentro de un bucle (N+1): p. ej. un
+SELECT ... FROM politica_seguridad WHERE ? = politica_seguridad.id_firewall
+por cada nodo al recorrer n.politicas.
+"""
+
+import re
+from functools import lru_cache
+
+
+class PresupuestoSuperado(Exception):
+    """Una petición ejecutó más sentencias SQL que las permitidas."""
+
+
+_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+# ?, %s, %(nombre)s, :nombre, $1
+_PARAMETROS = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+# SQLAlchemy reutiliza el mismo texto en todas las ejecuciones de una
+# consulta: normalizamos cada texto distinto una sola vez
+@lru_cache(maxsize=2048)
+def forma_sentencia(sentencia):
+    """Sentencia normalizada: misma forma = misma consulta con otros parámetros."""
+    forma = _CADENAS.sub("?", sentencia)
+    forma = _PARAMETROS.sub("?", forma)
+    forma = _NUMEROS.sub("?", forma)
+    forma = _LISTAS.sub("(?)", forma)
+    return _ESPACIOS.sub(" ", forma).strip()
+
+
+class TrazaSQL:
+    """Sentencias de una petición agrupadas por forma."""
+
+    def __init__(self):
+        self.total = 0
+        self.segundos = 0.0
+        # forma -> [veces, segundos]
+        self.formas = {}
+
+    def registrar(self, sentencia, segundos):
+        self.total += 1
+        self.segundos += segundos
+        forma = forma_sentencia(sentencia)
+        datos = self.formas.get(forma)
+        if datos is None:
+            datos = self.formas[forma] = [0, 0.0]
+        datos[0] += 1
+        datos[1] += segundos
+
+    def resumen(self):
+        """[(forma, veces, segundos)] de más a menos repetida."""
+        filas = [(forma, veces, segundos) for forma, (veces, segundos) in self.formas.items()]
+        return sorted(filas, key=lambda f: (-f[1], -f[2]))
+
+    def posibles_n1(self, umbral):
+        """Formas ejecutadas al menos `umbral` veces."""
+        return [fila for fila in self.resumen() if fila[1] >= umbral]